@@ -1,4 +1,4 @@
-qFROM gcc:latest
+FROM gcc:latest
 
 RUN apt-get update && apt-get install -y \
     time \
@@ -10,6 +10,10 @@ WORKDIR /workspace
 RUN echo "ulimit -v 131072" >> /etc/bash.bashrc  # 128MB virtual memory
 RUN echo "ulimit -t 30" >> /etc/bash.bashrc     # 30 second CPU time
 
+# Timing supervisor used by the judge for every run
+COPY docker/supervisor.c /usr/local/src/supervisor.c
+RUN gcc -O2 -static -o /usr/local/bin/judge-supervisor /usr/local/src/supervisor.c -lm
+
 COPY docker/run_cpp.sh /usr/local/bin/run_cpp.sh
 RUN chmod +x /usr/local/bin/run_cpp.sh
 
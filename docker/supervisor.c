@@ -0,0 +1,288 @@
+/*
+ * judge-supervisor: runs one solution under precise time limits.
+ *
+ *   judge-supervisor --cpu-limit SEC --wall-limit SEC [--output-limit BYTES] [--report-fd N] -- CMD [ARGS...]
+ *
+ * The solution is forked into its own process group. CPU time is capped with
+ * ITIMER_PROF (preserved across execve) backed by RLIMIT_CPU, wall time with
+ * ITIMER_REAL in the supervisor. When stdout and stderr are redirected to
+ * files, RLIMIT_FSIZE kills the solution with SIGXFSZ as soon as either one
+ * grows past the output limit. Once the solution exits, a single-line JSON
+ * report is written to the report fd (3 by default), which the solution never
+ * inherits. The supervisor exits with the solution's exit code, or 128 plus
+ * the terminating signal, and only after every process the solution started
+ * is gone, so nothing survives into the next test of a batch.
+ */
+#define _GNU_SOURCE
+#include <dirent.h>
+#include <errno.h>
+#include <fcntl.h>
+#include <math.h>
+#include <signal.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <sys/prctl.h>
+#include <sys/resource.h>
+#include <sys/stat.h>
+#include <sys/time.h>
+#include <sys/wait.h>
+#include <time.h>
+#include <unistd.h>
+
+static volatile sig_atomic_t wall_expired = 0;
+static volatile pid_t child_pid = 0;
+
+static void on_wall_limit(int sig)
+{
+    (void)sig;
+    wall_expired = 1;
+    if (child_pid > 0) {
+        kill(-child_pid, SIGKILL);
+        kill(child_pid, SIGKILL);
+    }
+}
+
+static struct timeval to_timeval(double seconds)
+{
+    struct timeval tv;
+    tv.tv_sec = (time_t)seconds;
+    tv.tv_usec = (suseconds_t)((seconds - (double)tv.tv_sec) * 1e6);
+    if (tv.tv_sec == 0 && tv.tv_usec == 0)
+        tv.tv_usec = 1;
+    return tv;
+}
+
+static double elapsed_since(const struct timespec *start)
+{
+    struct timespec now;
+    clock_gettime(CLOCK_MONOTONIC, &now);
+    return (double)(now.tv_sec - start->tv_sec) + (double)(now.tv_nsec - start->tv_nsec) / 1e9;
+}
+
+/* Runtimes such as CPython ignore SIGXFSZ and see EFBIG instead, so a file
+ * that reached the limit counts as exceeded too. */
+static int output_at_limit(int fd, long long output_limit)
+{
+    struct stat st;
+
+    if (output_limit <= 0 || fstat(fd, &st) != 0 || !S_ISREG(st.st_mode))
+        return 0;
+    return st.st_size >= output_limit;
+}
+
+/* Sends SIGKILL to every child of the supervisor and reports whether there
+ * were any. */
+static int kill_children(pid_t self)
+{
+    DIR *proc = opendir("/proc");
+    struct dirent *entry;
+    int found = 0;
+
+    if (proc == NULL)
+        return 0;
+    while ((entry = readdir(proc)) != NULL) {
+        char path[64];
+        char line[512];
+        char *end;
+        char *fields;
+        char state;
+        int ppid;
+        ssize_t length;
+        int fd;
+        long pid = strtol(entry->d_name, &end, 10);
+
+        if (*end != '\0' || pid <= 0)
+            continue;
+        snprintf(path, sizeof(path), "/proc/%ld/stat", pid);
+        fd = open(path, O_RDONLY);
+        if (fd < 0)
+            continue;
+        length = read(fd, line, sizeof(line) - 1);
+        close(fd);
+        if (length <= 0)
+            continue;
+        line[length] = '\0';
+
+        /* The command name may contain spaces, so fields are read after it. */
+        fields = strrchr(line, ')');
+        if (fields != NULL && sscanf(fields + 1, " %c %d", &state, &ppid) == 2 && ppid == self) {
+            kill((pid_t)pid, SIGKILL);
+            found = 1;
+        }
+    }
+    closedir(proc);
+    return found;
+}
+
+/* Kills and reaps every remaining descendant. As the subreaper the supervisor
+ * adopts each orphan, so killing its children until none are left also
+ * reaches processes that left the process group with setsid or a double
+ * fork. Bounded in case a process cannot be killed. */
+static void kill_descendants(void)
+{
+    const struct timespec pause = {0, 1000000};
+    struct timespec start;
+    pid_t self = getpid();
+
+    clock_gettime(CLOCK_MONOTONIC, &start);
+    while (elapsed_since(&start) < 1.0) {
+        pid_t reaped;
+
+        kill_children(self);
+        while ((reaped = waitpid(-1, NULL, WNOHANG)) > 0)
+            ;
+        if (reaped < 0 && errno == ECHILD)
+            return;
+        nanosleep(&pause, NULL);
+    }
+}
+
+static void usage(void)
+{
+    fprintf(stderr, "usage: judge-supervisor --cpu-limit SEC --wall-limit SEC [--output-limit BYTES] "
+                    "[--report-fd N] -- CMD [ARGS...]\n");
+    exit(125);
+}
+
+static void run_child(double cpu_limit, long long output_limit, char **argv)
+{
+    struct itimerval cpu_timer;
+    struct rlimit cpu_rlimit;
+    struct rlimit output_rlimit;
+
+    setpgid(0, 0);
+
+    memset(&cpu_timer, 0, sizeof(cpu_timer));
+    cpu_timer.it_value = to_timeval(cpu_limit);
+    if (setitimer(ITIMER_PROF, &cpu_timer, NULL) != 0) {
+        perror("judge-supervisor: setitimer");
+        _exit(126);
+    }
+
+    /* Backstop in case the solution blocks or handles SIGPROF. */
+    cpu_rlimit.rlim_cur = (rlim_t)ceil(cpu_limit) + 1;
+    cpu_rlimit.rlim_max = cpu_rlimit.rlim_cur + 1;
+    setrlimit(RLIMIT_CPU, &cpu_rlimit);
+
+    if (output_limit > 0) {
+        output_rlimit.rlim_cur = (rlim_t)output_limit;
+        output_rlimit.rlim_max = (rlim_t)output_limit;
+        setrlimit(RLIMIT_FSIZE, &output_rlimit);
+    }
+
+    execvp(argv[0], argv);
+    fprintf(stderr, "judge-supervisor: cannot execute %s: %s\n", argv[0], strerror(errno));
+    _exit(127);
+}
+
+int main(int argc, char **argv)
+{
+    double cpu_limit = -1.0;
+    double wall_limit = -1.0;
+    long long output_limit = 0;
+    int report_fd = 3;
+    int cmd_index = -1;
+    int i;
+
+    for (i = 1; i < argc; i++) {
+        if (strcmp(argv[i], "--") == 0) {
+            cmd_index = i + 1;
+            break;
+        } else if (strcmp(argv[i], "--cpu-limit") == 0 && i + 1 < argc) {
+            cpu_limit = strtod(argv[++i], NULL);
+        } else if (strcmp(argv[i], "--wall-limit") == 0 && i + 1 < argc) {
+            wall_limit = strtod(argv[++i], NULL);
+        } else if (strcmp(argv[i], "--output-limit") == 0 && i + 1 < argc) {
+            output_limit = strtoll(argv[++i], NULL, 10);
+        } else if (strcmp(argv[i], "--report-fd") == 0 && i + 1 < argc) {
+            report_fd = atoi(argv[++i]);
+        } else {
+            usage();
+        }
+    }
+    if (cmd_index < 0 || cmd_index >= argc || cpu_limit <= 0 || wall_limit <= 0)
+        usage();
+
+    if (fcntl(report_fd, F_SETFD, FD_CLOEXEC) != 0) {
+        fprintf(stderr, "judge-supervisor: report fd %d is not open\n", report_fd);
+        return 125;
+    }
+
+    /* Adopt orphaned descendants so their usage is counted as well. */
+    prctl(PR_SET_CHILD_SUBREAPER, 1);
+
+    struct sigaction action;
+    memset(&action, 0, sizeof(action));
+    action.sa_handler = on_wall_limit;
+    sigemptyset(&action.sa_mask);
+    sigaction(SIGALRM, &action, NULL);
+
+    struct timespec start;
+    clock_gettime(CLOCK_MONOTONIC, &start);
+
+    pid_t pid = fork();
+    if (pid < 0) {
+        perror("judge-supervisor: fork");
+        return 125;
+    }
+    if (pid == 0)
+        run_child(cpu_limit, output_limit, argv + cmd_index);
+
+    setpgid(pid, pid);
+    child_pid = pid;
+
+    struct itimerval wall_timer;
+    memset(&wall_timer, 0, sizeof(wall_timer));
+    wall_timer.it_value = to_timeval(wall_limit);
+    setitimer(ITIMER_REAL, &wall_timer, NULL);
+
+    int status = 0;
+    while (waitpid(pid, &status, 0) < 0) {
+        if (errno != EINTR) {
+            perror("judge-supervisor: waitpid");
+            return 125;
+        }
+    }
+    double wall_time = elapsed_since(&start);
+    int wall_exceeded = wall_expired != 0;
+
+    memset(&wall_timer, 0, sizeof(wall_timer));
+    setitimer(ITIMER_REAL, &wall_timer, NULL);
+
+    /* Nothing the solution started may outlive it. */
+    kill(-pid, SIGKILL);
+    kill_descendants();
+
+    struct rusage usage;
+    getrusage(RUSAGE_CHILDREN, &usage);
+    double cpu_time = (double)usage.ru_utime.tv_sec + (double)usage.ru_utime.tv_usec / 1e6
+                    + (double)usage.ru_stime.tv_sec + (double)usage.ru_stime.tv_usec / 1e6;
+
+    int exit_code = 0;
+    int term_signal = 0;
+    if (WIFEXITED(status)) {
+        exit_code = WEXITSTATUS(status);
+    } else if (WIFSIGNALED(status)) {
+        term_signal = WTERMSIG(status);
+        exit_code = 128 + term_signal;
+    }
+
+    int cpu_exceeded = cpu_time > cpu_limit || term_signal == SIGPROF || term_signal == SIGXCPU;
+    int output_exceeded = term_signal == SIGXFSZ
+                       || output_at_limit(STDOUT_FILENO, output_limit)
+                       || output_at_limit(STDERR_FILENO, output_limit);
+
+    /* The solution may have written to the report file through its path. */
+    if (lseek(report_fd, 0, SEEK_SET) == 0)
+        ftruncate(report_fd, 0);
+    dprintf(report_fd,
+            "{\"exit_code\": %d, \"signal\": %d, \"cpu_time\": %.6f, \"wall_time\": %.6f, "
+            "\"max_rss_kb\": %ld, \"cpu_limit_exceeded\": %s, \"wall_limit_exceeded\": %s, "
+            "\"output_limit_exceeded\": %s}\n",
+            exit_code, term_signal, cpu_time, wall_time, usage.ru_maxrss,
+            cpu_exceeded ? "true" : "false", wall_exceeded ? "true" : "false",
+            output_exceeded ? "true" : "false");
+
+    return exit_code;
+}
@@ -0,0 +1,72 @@
+// Custom checker for Cycle Finding: accepts any negative cycle.
+//
+//   checker <input> <output> <answer>
+//
+// Exit codes follow testlib: 0 accepted, 1 wrong answer, 2 presentation error.
+#include <cstdio>
+#include <fstream>
+#include <map>
+#include <sstream>
+#include <string>
+#include <utility>
+#include <vector>
+
+static int verdict(int code, const std::string& message)
+{
+    fprintf(stderr, "%s\n", message.c_str());
+    return code;
+}
+
+int main(int argc, char** argv)
+{
+    if (argc < 4)
+        return verdict(3, "usage: checker <input> <output> <answer>");
+
+    std::ifstream input(argv[1]), output(argv[2]), answer(argv[3]);
+    long long n, m;
+    input >> n >> m;
+    // Cheapest edge per ordered pair, since parallel edges are allowed.
+    std::map<std::pair<long long, long long>, long long> weight;
+    for (long long i = 0; i < m; i++) {
+        long long a, b, c;
+        input >> a >> b >> c;
+        auto key = std::make_pair(a, b);
+        auto it = weight.find(key);
+        if (it == weight.end() || c < it->second)
+            weight[key] = c;
+    }
+
+    std::string expected, actual;
+    answer >> expected;
+    if (!(output >> actual))
+        return verdict(2, "empty output");
+    if (actual != "YES" && actual != "NO")
+        return verdict(2, "expected YES or NO, got " + actual);
+    if (actual != expected)
+        return verdict(1, "expected " + expected + ", got " + actual);
+    if (actual == "NO")
+        return verdict(0, "no negative cycle");
+
+    std::string line;
+    std::getline(output, line);
+    if (!std::getline(output, line))
+        return verdict(2, "missing cycle");
+    std::istringstream tokens(line);
+    std::vector<long long> cycle;
+    long long node;
+    while (tokens >> node)
+        cycle.push_back(node);
+    if (cycle.size() < 2 || cycle.front() != cycle.back())
+        return verdict(1, "cycle must start and end at the same node");
+
+    long long total = 0;
+    for (size_t i = 0; i + 1 < cycle.size(); i++) {
+        auto it = weight.find(std::make_pair(cycle[i], cycle[i + 1]));
+        if (it == weight.end())
+            return verdict(1, "no edge " + std::to_string(cycle[i]) + " -> " + std::to_string(cycle[i + 1]));
+        total += it->second;
+    }
+    if (total >= 0)
+        return verdict(1, "cycle weight " + std::to_string(total) + " is not negative");
+    return verdict(0, "negative cycle of weight " + std::to_string(total));
+}
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Query plan check for the hot lookups of Adaptive Code Judge.
+
+Asks the database for the plan of each query the services run on every
+request or judgement and fails if any of them reads a whole table instead of
+using an index. Runs against an in-memory SQLite database by default; pass
+--database-uri to check SQLite or PostgreSQL databases created by the app.
+"""
+
+import os
+import re
+import sys
+import logging
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from flask import Flask
+from sqlalchemy import select
+
+from models import db, TestCase, Benchmark, Submission, SubmissionTestResult
+from models.migrations import upgrade_schema
+
+
+# SQLite reports "SCAN submissions" (or "SCAN TABLE submissions" before 3.36)
+# for a full scan, and adds "USING INDEX" when the scan walks an index.
+SQLITE_FULL_SCAN = re.compile(r'^SCAN (TABLE )?\w+(?!.*USING (COVERING )?INDEX)')
+POSTGRES_FULL_SCAN = re.compile(r'Seq Scan on \w+')
+
+
+def hot_queries():
+    """The lookups that must stay indexed, as the services build them."""
+    
+    return {
+        'submissions for problem': select(Submission).filter_by(problem_id=1).order_by(
+            Submission.created_at.desc()
+        ).limit(100),
+        'submissions for problem and user': select(Submission).filter_by(problem_id=1, user_id='user').order_by(
+            Submission.created_at.desc()
+        ).limit(100),
+        'results for submission': select(SubmissionTestResult).filter_by(submission_id=1),
+        'test cases for problem': select(TestCase).filter_by(problem_id=1).order_by(TestCase.created_at.asc()),
+        'benchmarks for problem': select(Benchmark).filter_by(problem_id=1).order_by(Benchmark.created_at.desc()),
+        'verdict cache candidates': select(Submission).filter_by(source_hash='0' * 64),
+    }
+
+
+def explain(connection, statement):
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={'literal_binds': True}))
+    
+    if connection.dialect.name == 'sqlite':
+        # EXPLAIN does not read the database file, so a pooled connection
+        # would not notice indexes added by the upgrade until something does.
+        connection.exec_driver_sql('SELECT count(*) FROM sqlite_master').fetchall()
+        rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}').fetchall()
+        plan = [row[-1] for row in rows]
+        return plan, [line for line in plan if SQLITE_FULL_SCAN.search(line)]
+    
+    if connection.dialect.name == 'postgresql':
+        # Small tables are cheaper to scan, so only fall back to a sequential
+        # scan when no index can answer the query at all.
+        connection.exec_driver_sql('SET LOCAL enable_seqscan = off')
+        plan = [row[0] for row in connection.exec_driver_sql(f'EXPLAIN {sql}').fetchall()]
+        return plan, [line for line in plan if POSTGRES_FULL_SCAN.search(line)]
+    
+    raise ValueError(f"Unsupported database: {connection.dialect.name}")
+
+
+def check_query_plans(database_uri):
+    """Print the plan of every hot query and return the names that scan a table."""
+    
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
+    db.init_app(app)
+    
+    failures = []
+    with app.app_context():
+        db.create_all()
+        upgrade_schema(db.engine)
+        
+        with db.engine.begin() as connection:
+            for name, statement in hot_queries().items():
+                plan, scans = explain(connection, statement)
+                print(f"{'FULL SCAN' if scans else 'OK':<9} {name}")
+                for line in plan:
+                    print(f"          {line}")
+                if scans:
+                    failures.append(name)
+    
+    return failures
+
+
+def main():
+    """Main function."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Check that hot queries use indexes')
+    parser.add_argument('--database-uri', default='sqlite://',
+                       help='Database to check (default: in-memory SQLite)')
+    
+    args = parser.parse_args()
+    
+    try:
+        failures = check_query_plans(args.database_uri)
+    except Exception:
+        logging.exception("Query plan check failed")
+        sys.exit(2)
+    
+    if failures:
+        print(f"\n{len(failures)} hot queries scan a whole table: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
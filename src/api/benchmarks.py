@@ -1,5 +1,5 @@
 from flask import Blueprint, request, jsonify, current_app
-from services.benchmark_service import BenchmarkService
+from services.registry import get_services
 
 benchmarks_bp = Blueprint('benchmarks', __name__, url_prefix='/api/benchmarks')
 
@@ -15,7 +15,7 @@ def create_benchmark():
         if not data.get('problem_id'):
             return jsonify({'error': 'Missing required field: problem_id'}), 400
         
-        service = BenchmarkService()
+        service = get_services().benchmarks
         benchmark = service.create_benchmark(
             problem_id=data['problem_id'],
             repetitions=data.get('repetitions'),
@@ -88,7 +88,7 @@ def get_benchmarks_for_problem(problem_id):
 def get_active_benchmark(problem_id):
     
     try:
-        service = BenchmarkService()
+        service = get_services().benchmarks
         benchmark = service.get_active_benchmark(problem_id)
         
         if not benchmark:
@@ -120,7 +120,7 @@ def set_active_benchmark(problem_id):
         if not data.get('benchmark_id'):
             return jsonify({'error': 'Missing required field: benchmark_id'}), 400
         
-        service = BenchmarkService()
+        service = get_services().benchmarks
         active_benchmark = service.set_active_benchmark(
             problem_id=problem_id,
             benchmark_id=data['benchmark_id'],
@@ -143,7 +143,7 @@ def get_time_limit(problem_id):
     try:
         language = request.args.get('language', 'cpp')
         
-        service = BenchmarkService()
+        service = get_services().benchmarks
         time_limit = service.get_time_limit_for_submission(problem_id, language)
         
         active_benchmark = service.get_active_benchmark(problem_id)
@@ -179,7 +179,7 @@ def activate_benchmark(benchmark_id):
         if not benchmark:
             return jsonify({'error': 'Benchmark not found'}), 404
         
-        service = BenchmarkService()
+        service = get_services().benchmarks
         active_benchmark = service.set_active_benchmark(
             problem_id=benchmark.problem_id,
             benchmark_id=benchmark_id,
@@ -1,6 +1,9 @@
 from flask import Blueprint, jsonify
 import docker
 from models import db
+from executor.docker_client import get_docker_client, reset_on_connection_error
+from services.registry import get_services
+from services.result_writer import get_result_writer
 
 health_bp = Blueprint('health', __name__)
 
@@ -19,10 +22,11 @@ def health_check():
         health_status['status'] = 'unhealthy'
     
     try:
-        client = docker.from_env()
+        client = get_docker_client(get_services().config)
         client.ping()
         health_status['services']['docker'] = 'healthy'
     except Exception as e:
+        reset_on_connection_error(e)
         health_status['services']['docker'] = f'unhealthy: {str(e)}'
         health_status['status'] = 'unhealthy'
     
@@ -44,7 +48,8 @@ def detailed_health_check():
             'default_time_limit': AppConfig.DEFAULT_TIME_LIMIT,
             'default_memory_limit': AppConfig.DEFAULT_MEMORY_LIMIT,
         },
-        'docker_images': {}
+        'docker_images': {},
+        'caches': {}
     }
     try:
         from models import Problem, TestCase, Submission, Benchmark
@@ -71,7 +76,7 @@ def detailed_health_check():
         }
         health_info['status'] = 'unhealthy'
     try:
-        client = docker.from_env()
+        client = get_docker_client(get_services().config)
         client.ping()
         required_images = [AppConfig.DOCKER_CPP_IMAGE, AppConfig.DOCKER_PYTHON_IMAGE]
         
@@ -96,11 +101,21 @@ def detailed_health_check():
         }
         
     except Exception as e:
+        reset_on_connection_error(e)
         health_info['services']['docker'] = {
             'status': 'unhealthy',
             'error': str(e)
         }
         health_info['status'] = 'unhealthy'
     
+    from executor.compilation_cache import get_compilation_cache
+    
+    compilation_cache = get_compilation_cache(AppConfig)
+    health_info['caches']['compilation'] = compilation_cache.stats() if compilation_cache else {'enabled': False}
+    health_info['caches']['verdict'] = get_services().submissions.verdict_cache.stats()
+    
+    result_writer = get_result_writer()
+    health_info['result_writer'] = result_writer.stats() if result_writer else {'running': False}
+    
     status_code = 200 if health_info['status'] == 'healthy' else 503
     return jsonify(health_info), status_code
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify, current_app
-from services.problem_service import ProblemService
+from services.registry import get_services
 from models import Problem
+from models.submission import Language
 
 problems_bp = Blueprint('problems', __name__, url_prefix='/api/problems')
 
@@ -9,7 +10,7 @@ problems_bp = Blueprint('problems', __name__, url_prefix='/api/problems')
 def get_problems():
     
     try:
-        service = ProblemService()
+        service = get_services().problems
         
         # Parse query parameters
         active_only = request.args.get('active', 'true').lower() == 'true'
@@ -39,7 +40,7 @@ def get_problem(problem_id):
     """Get a specific problem by ID."""
     
     try:
-        service = ProblemService()
+        service = get_services().problems
         problem = service.get_problem(problem_id)
         
         if not problem:
@@ -76,7 +77,7 @@ def create_problem():
             if not data.get(field):
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
-        service = ProblemService()
+        service = get_services().problems
         problem = service.create_problem(
             title=data['title'],
             description=data['description'],
@@ -84,7 +85,12 @@ def create_problem():
             time_limit_base=data.get('time_limit_base'),
             memory_limit=data.get('memory_limit'),
             difficulty=data.get('difficulty', 'medium'),
-            tags=data.get('tags', [])
+            tags=data.get('tags', []),
+            checker_type=data.get('checker_type'),
+            checker_abs_epsilon=data.get('checker_abs_epsilon'),
+            checker_rel_epsilon=data.get('checker_rel_epsilon'),
+            checker_source=data.get('checker_source'),
+            verdict_policy=data.get('verdict_policy')
         )
         
         return jsonify(problem.to_dict()), 201
@@ -101,7 +107,7 @@ def get_test_cases(problem_id):
     """Get test cases for a problem."""
     
     try:
-        service = ProblemService()
+        service = get_services().problems
         
         # Check if problem exists
         problem = service.get_problem(problem_id)
@@ -144,7 +150,7 @@ def add_test_case(problem_id):
             if field not in data:
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
-        service = ProblemService()
+        service = get_services().problems
         test_case = service.add_test_case(
             problem_id=problem_id,
             name=data['name'],
@@ -171,7 +177,7 @@ def get_problem_statistics(problem_id):
     """Get statistics for a problem."""
     
     try:
-        service = ProblemService()
+        service = get_services().problems
         
         # Check if problem exists
         problem = service.get_problem(problem_id)
@@ -186,6 +192,34 @@ def get_problem_statistics(problem_id):
         return jsonify({'error': 'Internal server error'}), 500
 
 
+@problems_bp.route('/<int:problem_id>/test-order', methods=['GET'])
+def get_test_order(problem_id):
+    """Get the failure-likelihood test order and its expected time saving."""
+    
+    try:
+        services = get_services()
+        problem = services.problems.get_problem(problem_id)
+        if not problem:
+            return jsonify({'error': 'Problem not found'}), 404
+        
+        try:
+            language = Language(request.args.get('language', 'cpp').lower())
+        except ValueError:
+            return jsonify({'error': f"Unsupported language: {request.args.get('language')}"}), 400
+        
+        time_limit = services.benchmarks.get_time_limit_for_submission(problem_id, language.value)
+        test_cases = services.problems.get_test_cases(problem_id, include_hidden=True)
+        schedule = services.test_ordering.schedule(problem_id, language, test_cases, time_limit)
+        
+        result = schedule.to_dict()
+        result.update({'problem_id': problem_id, 'language': language.value, 'time_limit': time_limit})
+        return jsonify(result)
+        
+    except Exception as e:
+        current_app.logger.error(f"Error getting test order for problem {problem_id}: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+
 @problems_bp.route('/<int:problem_id>', methods=['PUT'])
 def update_problem(problem_id):
     """Update a problem."""
@@ -196,7 +230,7 @@ def update_problem(problem_id):
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
-        service = ProblemService()
+        service = get_services().problems
         problem = service.update_problem(problem_id, **data)
         
         if not problem:
@@ -204,6 +238,8 @@ def update_problem(problem_id):
         
         return jsonify(problem.to_dict())
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"Error updating problem {problem_id}: {e}")
         return jsonify({'error': 'Internal server error'}), 500
@@ -214,7 +250,7 @@ def delete_problem(problem_id):
     """Delete (deactivate) a problem."""
     
     try:
-        service = ProblemService()
+        service = get_services().problems
         success = service.delete_problem(problem_id)
         
         if not success:
@@ -232,7 +268,7 @@ def delete_test_case(test_case_id):
     """Delete a test case."""
     
     try:
-        service = ProblemService()
+        service = get_services().problems
         success = service.delete_test_case(test_case_id)
         
         if not success:
@@ -1,5 +1,8 @@
 from flask import Blueprint, request, jsonify, current_app
-from services.submission_service import SubmissionService
+from models import db
+from models.submission import SubmissionStatus
+from services.registry import get_services
+from services.judge_queue import get_judge_queue
 
 submissions_bp = Blueprint('submissions', __name__, url_prefix='/api/submissions')
 
@@ -19,15 +22,18 @@ def create_submission():
             if not data.get(field):
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
-        service = SubmissionService()
+        service = get_services().submissions
         submission = service.create_submission(
             problem_id=data['problem_id'],
             language=data['language'],
             source_code=data['source_code'],
-            user_id=data.get('user_id')
+            user_id=data.get('user_id'),
+            execute=False,
+            verdict_policy=data.get('verdict_policy')
         )
+        get_judge_queue().submit(submission.id)
         
-        return jsonify(submission.to_dict()), 201
+        return jsonify(submission.to_dict()), 202
         
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
@@ -41,25 +47,26 @@ def get_submission(submission_id):
     """Get a specific submission by ID."""
     
     try:
-        service = SubmissionService()
-        submission = service.get_submission(submission_id)
-        
-        if not submission:
-            return jsonify({'error': 'Submission not found'}), 404
+        service = get_services().submissions
         
         # Check if source code should be included
         include_code = request.args.get('include_code', 'false').lower() == 'true'
         
+        submission = service.get_submission(submission_id, include_code=include_code)
+        
+        if not submission:
+            return jsonify({'error': 'Submission not found'}), 404
+        
         result = submission.to_dict(include_code=include_code)
         
         # Include test results if requested
         include_results = request.args.get('include_results', 'true').lower() == 'true'
         if include_results:
-            test_results = service.get_submission_results(submission_id)
-            
             # Check if output should be included (only for non-hidden test cases or with permission)
             include_output = request.args.get('include_output', 'false').lower() == 'true'
             
+            test_results = service.get_submission_results(submission_id, include_output=include_output)
+            
             result['test_results'] = []
             for tr in test_results:
                 tr_dict = tr.to_dict(include_output=include_output)
@@ -81,7 +88,7 @@ def get_submissions():
     """Get submissions with optional filtering."""
     
     try:
-        service = SubmissionService()
+        service = get_services().submissions
         
         # Parse query parameters
         problem_id = request.args.get('problem_id', type=int)
@@ -112,18 +119,18 @@ def get_submission_results(submission_id):
     """Get detailed test results for a submission."""
     
     try:
-        service = SubmissionService()
+        service = get_services().submissions
         
         # Check if submission exists
         submission = service.get_submission(submission_id)
         if not submission:
             return jsonify({'error': 'Submission not found'}), 404
         
-        test_results = service.get_submission_results(submission_id)
-        
         # Check if output should be included
         include_output = request.args.get('include_output', 'false').lower() == 'true'
         
+        test_results = service.get_submission_results(submission_id, include_output=include_output)
+        
         results = []
         for tr in test_results:
             tr_dict = tr.to_dict(include_output=include_output)
@@ -164,14 +171,24 @@ def judge_submission():
             if not data.get(field):
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
-        service = SubmissionService()
+        service = get_services().submissions
         submission = service.create_submission(
             problem_id=data['problem_id'],
             language=data['language'],
             source_code=data['source_code'],
-            user_id=data.get('user_id', 'anonymous')
+            user_id=data.get('user_id', 'anonymous'),
+            execute=False,
+            verdict_policy=data.get('verdict_policy')
         )
         
+        judge_queue = get_judge_queue()
+        judge_queue.submit(submission.id)
+        judge_queue.wait(submission.id, timeout=current_app.config['JUDGE_SYNC_TIMEOUT'])
+        
+        db.session.refresh(submission)
+        if submission.status in (SubmissionStatus.PENDING, SubmissionStatus.RUNNING):
+            return jsonify(submission.to_dict()), 202
+        
         # Return submission with results
         test_results = service.get_submission_results(submission.id)
         
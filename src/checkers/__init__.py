@@ -0,0 +1,15 @@
+from checkers.comparator import Comparison, compare_output, open_mapped
+from checkers.diff import bounded_diff
+from checkers.tokens import compare_tokens
+from checkers.engine import CheckerError, CheckerRegistry, OutputChecker
+
+__all__ = [
+    'Comparison',
+    'compare_output',
+    'open_mapped',
+    'bounded_diff',
+    'compare_tokens',
+    'CheckerError',
+    'CheckerRegistry',
+    'OutputChecker'
+]
@@ -0,0 +1,173 @@
+import mmap
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, Optional
+
+WHITESPACE = b' \t\n\r\x0b\x0c'
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_CONTEXT = 40
+
+
+@dataclass
+class Comparison:
+    
+    equal: bool
+    offset: Optional[int] = None
+    line: Optional[int] = None
+    column: Optional[int] = None
+    expected_excerpt: str = ""
+    actual_excerpt: str = ""
+    presentation_error: bool = False
+    # Free-form explanation from a custom checker, used instead of a position.
+    detail: Optional[str] = None
+    
+    @property
+    def message(self) -> str:
+        if self.equal:
+            return "Output matches"
+        if self.detail is not None:
+            return self.detail
+        return (
+            f"Output differs at line {self.line}, column {self.column}: "
+            f"expected {self.expected_excerpt!r}, got {self.actual_excerpt!r}"
+        )
+
+
+class _Reader:
+    """Chunked reader that remembers a short tail of what it has consumed."""
+    
+    def __init__(self, source: BinaryIO, chunk_size: int, context: int):
+        self.source = source
+        self.chunk_size = chunk_size
+        self.context = context
+        self.buffer = b''
+        self.pos = 0
+        self.consumed = 0
+        self.lines = 0
+        self.line_start = 0
+        self.tail = b''
+    
+    def fill(self) -> bool:
+        if self.pos < len(self.buffer):
+            return True
+        chunk = self.source.read(self.chunk_size)
+        if not chunk:
+            return False
+        self.tail = (self.tail + self.buffer[-self.context:])[-self.context:] if self.context else b''
+        self.buffer = chunk
+        self.pos = 0
+        return True
+    
+    def advance(self, count: int):
+        consumed = self.buffer[self.pos:self.pos + count]
+        newlines = consumed.count(b'\n')
+        if newlines:
+            self.lines += newlines
+            self.line_start = self.consumed + consumed.rindex(b'\n') + 1
+        self.pos += count
+        self.consumed += count
+    
+    def skip_whitespace(self) -> bool:
+        """Consume whitespace; return False once the stream is exhausted."""
+        while self.fill():
+            stripped = self.buffer[self.pos:].lstrip(WHITESPACE)
+            self.advance(len(self.buffer) - self.pos - len(stripped))
+            if stripped:
+                return True
+        return False
+    
+    def before(self) -> bytes:
+        return (self.tail + self.buffer[:self.pos])[-self.context:] if self.context else b''
+    
+    def after(self) -> bytes:
+        # Read-ahead is kept in the buffer so later scans still see it.
+        while len(self.buffer) - self.pos < self.context:
+            chunk = self.source.read(self.context)
+            if not chunk:
+                break
+            self.tail = self.before()
+            self.buffer = self.buffer[self.pos:] + chunk
+            self.pos = 0
+        return self.buffer[self.pos:self.pos + self.context]
+
+
+def _first_difference(left: memoryview, right: memoryview) -> int:
+    """Index of the first differing byte, or the common length if none differs."""
+    length = min(len(left), len(right))
+    if left[:length] == right[:length]:
+        return length
+    # Binary search over slice equality keeps the byte scanning in C.
+    low, high = 0, length
+    while high - low > 1:
+        middle = (low + high) // 2
+        if left[low:middle] == right[low:middle]:
+            low = middle
+        else:
+            high = middle
+    return low
+
+
+def compare_output(
+    expected: BinaryIO,
+    actual: BinaryIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    context: int = DEFAULT_CONTEXT
+) -> Comparison:
+    """Compare two outputs like ``expected.strip() == actual.strip()``, streaming.
+
+    Both streams are read in chunks and the comparison stops at the first
+    differing byte, unless everything left on both sides is whitespace. The
+    position of the difference is reported as a byte offset and a 1-based
+    line and column into the actual output, with up to ``context`` bytes of
+    surrounding text from each side.
+    """
+    left = _Reader(expected, chunk_size, context)
+    right = _Reader(actual, chunk_size, context)
+    
+    left.skip_whitespace()
+    right.skip_whitespace()
+    
+    while True:
+        has_left = left.fill()
+        has_right = right.fill()
+        if not has_left and not has_right:
+            return Comparison(equal=True)
+        
+        if has_left and has_right:
+            left_view = memoryview(left.buffer)[left.pos:]
+            right_view = memoryview(right.buffer)[right.pos:]
+            index = _first_difference(left_view, right_view)
+            left.advance(index)
+            right.advance(index)
+            if index == min(len(left_view), len(right_view)):
+                continue
+        
+        # The outputs diverge here; they are still equal if only trailing
+        # whitespace remains on both sides.
+        before = (left.before(), right.before())
+        offset, line, column = right.consumed, right.lines + 1, right.consumed - right.line_start + 1
+        left_after, right_after = left.after(), right.after()
+        if not left.skip_whitespace() and not right.skip_whitespace():
+            return Comparison(equal=True)
+        
+        return Comparison(
+            equal=False,
+            offset=offset,
+            line=line,
+            column=column,
+            expected_excerpt=(before[0] + left_after).decode('utf-8', errors='replace'),
+            actual_excerpt=(before[1] + right_after).decode('utf-8', errors='replace')
+        )
+
+
+@contextmanager
+def open_mapped(path: str) -> Iterator[BinaryIO]:
+    """Open a file for ``compare_output`` through a read-only memory map."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield f
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
@@ -0,0 +1,82 @@
+from collections import deque
+from itertools import zip_longest
+from typing import Iterable, List, Optional
+
+MAX_LINE_LENGTH = 200
+TRUNCATED = "... (diff truncated)"
+
+
+def _clip(line: str) -> str:
+    if len(line) > MAX_LINE_LENGTH:
+        return line[:MAX_LINE_LENGTH] + '...'
+    return line
+
+
+def bounded_diff(
+    expected: Iterable[str],
+    actual: Iterable[str],
+    max_divergent: int = 10,
+    context: int = 2,
+    max_bytes: int = 4096
+) -> str:
+    """Render the first ``max_divergent`` differing lines of two outputs.
+
+    Lines are paired by position in a single pass, so the cost is linear in
+    the lines read and reading stops once the budget is spent. Each divergent
+    line is shown with up to ``context`` matching lines around it, and the
+    rendered text never exceeds ``max_bytes``.
+    """
+    out: List[str] = []
+    budget = max_bytes - len(TRUNCATED)
+    divergent = 0
+    trailing = 0
+    previous = deque(maxlen=context)
+    last_shown: Optional[int] = None
+    
+    def emit(lines: List[str]) -> bool:
+        nonlocal budget
+        cost = sum(len(line.encode('utf-8')) + 1 for line in lines)
+        if cost > budget:
+            return False
+        out.extend(lines)
+        budget -= cost
+        return True
+    
+    for number, (left, right) in enumerate(zip_longest(expected, actual), start=1):
+        left = left.rstrip('\r\n') if left is not None else None
+        right = right.rstrip('\r\n') if right is not None else None
+        
+        if left == right:
+            if trailing:
+                if not emit([f"  {number:>6} | {_clip(left)}"]):
+                    out.append(TRUNCATED)
+                    break
+                last_shown = number
+                trailing -= 1
+            elif divergent < max_divergent:
+                previous.append((number, left))
+            else:
+                break
+            continue
+        
+        if divergent == max_divergent:
+            out.append(TRUNCATED)
+            break
+        divergent += 1
+        
+        first = previous[0][0] if previous else number
+        lines = [] if last_shown is not None and first == last_shown + 1 else [f"@@ line {first} @@"]
+        lines.extend(f"  {n:>6} | {_clip(text)}" for n, text in previous)
+        if left is not None:
+            lines.append(f"- {number:>6} | {_clip(left)}")
+        if right is not None:
+            lines.append(f"+ {number:>6} | {_clip(right)}")
+        
+        if not emit(lines):
+            out.append(TRUNCATED)
+            break
+        previous.clear()
+        last_shown = number
+        trailing = context
+    
+    return '\n'.join(out)
@@ -0,0 +1,133 @@
+import hashlib
+import io
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+from checkers.comparator import Comparison, compare_output, open_mapped
+from checkers.tokens import compare_tokens
+from executor import ExecutionStatus, PreparedProgram, StoredInput, TestDataStore, get_answer_store
+from models.problem import CheckerType
+
+
+logger = logging.getLogger(__name__)
+
+# Exit codes of testlib-style checkers.
+CHECKER_OK = 0
+CHECKER_WRONG_ANSWER = 1
+CHECKER_PRESENTATION_ERROR = 2
+
+MAX_CHECKER_MESSAGE = 1000
+
+
+class CheckerError(Exception):
+    """The checker itself failed, so the output could not be judged."""
+
+
+class OutputChecker:
+    """Judges one output against the expected answer for a problem.
+
+    Instances are built on the request thread by ``CheckerRegistry`` and hold
+    only plain values, so worker threads can share them.
+    """
+    
+    def __init__(
+        self,
+        checker_type: CheckerType,
+        answers: TestDataStore,
+        abs_epsilon: Optional[float] = None,
+        rel_epsilon: Optional[float] = None,
+        program: Optional[PreparedProgram] = None,
+        executor=None
+    ):
+        self.checker_type = checker_type
+        self.answers = answers
+        self.abs_epsilon = abs_epsilon
+        self.rel_epsilon = rel_epsilon
+        self.program = program
+        self.executor = executor
+    
+    def check(self, stored_input: StoredInput, stored_answer: StoredInput, output: str) -> Comparison:
+        if self.checker_type == CheckerType.CUSTOM:
+            return self._run_custom(stored_input, stored_answer, output)
+        
+        actual = io.BytesIO(output.encode('utf-8'))
+        with open_mapped(self.answers.path_for(stored_answer)) as expected:
+            if self.checker_type == CheckerType.TOKEN:
+                return compare_tokens(expected, actual)
+            if self.checker_type == CheckerType.FLOAT:
+                return compare_tokens(expected, actual, self.abs_epsilon, self.rel_epsilon)
+            return compare_output(expected, actual)
+    
+    def _run_custom(self, stored_input: StoredInput, stored_answer: StoredInput, output: str) -> Comparison:
+        if not self.program.success:
+            compilation = self.program.compilation
+            details = (compilation.stderr or compilation.error_message or "")[:MAX_CHECKER_MESSAGE]
+            raise CheckerError(f"Checker compilation failed: {details}")
+        
+        result = self.executor.run_checker(self.program, stored_input, stored_answer, output)
+        message = (result.stderr or result.stdout or '').strip()[:MAX_CHECKER_MESSAGE]
+        
+        if result.status == ExecutionStatus.SUCCESS:
+            return Comparison(equal=True, detail=message or None)
+        if result.status == ExecutionStatus.RUNTIME_ERROR and result.exit_code == CHECKER_WRONG_ANSWER:
+            return Comparison(equal=False, detail=message or "Wrong answer (custom checker)")
+        if result.status == ExecutionStatus.RUNTIME_ERROR and result.exit_code == CHECKER_PRESENTATION_ERROR:
+            return Comparison(
+                equal=False, presentation_error=True, detail=message or "Presentation error (custom checker)"
+            )
+        raise CheckerError(
+            f"Checker failed ({result.status.value}, exit code {result.exit_code}): "
+            f"{message or result.error_message or 'no output'}"
+        )
+
+
+class CheckerRegistry:
+    """Builds output checkers for problems, compiling custom checkers once.
+
+    A custom checker is compiled the first time a problem is judged with it
+    and kept for as long as its source does not change; the executor's
+    compilation cache also persists the binary across restarts.
+    """
+    
+    def __init__(self, config, executor):
+        self.config = config
+        self.executor = executor
+        self.answers = get_answer_store(config)
+        self._programs: Dict[int, Tuple[str, PreparedProgram]] = {}
+        self._lock = threading.Lock()
+    
+    def for_problem(self, problem) -> OutputChecker:
+        checker_type = problem.checker_type or CheckerType.EXACT
+        program = None
+        if checker_type == CheckerType.CUSTOM:
+            program = self._compiled(problem.id, problem.checker_source or '')
+        
+        return OutputChecker(
+            checker_type,
+            self.answers,
+            abs_epsilon=problem.checker_abs_epsilon,
+            rel_epsilon=problem.checker_rel_epsilon,
+            program=program,
+            executor=self.executor
+        )
+    
+    def _compiled(self, problem_id: int, source: str) -> PreparedProgram:
+        digest = hashlib.sha256(source.encode('utf-8')).hexdigest()
+        with self._lock:
+            entry = self._programs.get(problem_id)
+            if entry is not None and entry[0] == digest:
+                return entry[1]
+            
+            program = self.executor.prepare_cpp(source)
+            if program.success:
+                logger.info(f"Compiled custom checker for problem {problem_id}")
+            else:
+                logger.warning(f"Custom checker for problem {problem_id} failed to compile")
+            
+            # Infrastructure failures are retried on the next submission. A
+            # replaced checker is left in place for submissions still being
+            # judged with it.
+            if program.success or program.compilation.status == ExecutionStatus.COMPILATION_ERROR:
+                self._programs[problem_id] = (digest, program)
+            return program
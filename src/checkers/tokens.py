@@ -0,0 +1,122 @@
+import math
+import re
+from itertools import zip_longest
+from typing import BinaryIO, Iterator, Optional
+
+from checkers.comparator import DEFAULT_CHUNK_SIZE, DEFAULT_CONTEXT, Comparison
+
+TOKEN = re.compile(rb'[^ \t\n\r\x0b\x0c]+')
+
+
+class _Tokenizer:
+    """Yields whitespace-separated tokens from a stream, tracking positions."""
+    
+    def __init__(self, source: BinaryIO, chunk_size: int):
+        self.source = source
+        self.chunk_size = chunk_size
+        # Position just past the last token yielded (or of the end of input).
+        self.offset = 0
+        self.line = 1
+        self.column = 1
+    
+    def _move_to(self, data: bytes, start: int, end: int):
+        newlines = data.count(b'\n', start, end)
+        if newlines:
+            self.line += newlines
+            self.column = end - data.rindex(b'\n', start, end)
+        else:
+            self.column += end - start
+        self.offset += end - start
+    
+    def __iter__(self) -> Iterator[bytes]:
+        carry = b''
+        while True:
+            chunk = self.source.read(self.chunk_size)
+            data = carry + chunk
+            carry = b''
+            scanned = 0
+            for match in TOKEN.finditer(data):
+                # A token touching the end of the buffer may continue in the next chunk.
+                if chunk and match.end() == len(data):
+                    carry = data[match.start():]
+                    break
+                self._move_to(data, scanned, match.start())
+                self.token_offset, self.token_line, self.token_column = self.offset, self.line, self.column
+                self._move_to(data, match.start(), match.end())
+                scanned = match.end()
+                yield match.group()
+            self._move_to(data, scanned, len(data) - len(carry))
+            if not chunk:
+                return
+
+
+def _parse_float(token: bytes) -> Optional[float]:
+    try:
+        return float(token)
+    except ValueError:
+        return None
+
+
+def _close(expected: bytes, actual: bytes, abs_epsilon: Optional[float], rel_epsilon: Optional[float]) -> bool:
+    expected_value = _parse_float(expected)
+    actual_value = _parse_float(actual)
+    if expected_value is None or actual_value is None:
+        return False
+    if math.isnan(expected_value) or math.isnan(actual_value):
+        return math.isnan(expected_value) and math.isnan(actual_value)
+    if expected_value == actual_value:
+        return True
+    difference = abs(expected_value - actual_value)
+    if abs_epsilon is not None and difference <= abs_epsilon:
+        return True
+    return rel_epsilon is not None and difference <= rel_epsilon * abs(expected_value)
+
+
+def _excerpt(token: Optional[bytes], context: int) -> str:
+    if token is None:
+        return "<end of output>"
+    if len(token) > context:
+        token = token[:context] + b'...'
+    return token.decode('utf-8', errors='replace')
+
+
+def compare_tokens(
+    expected: BinaryIO,
+    actual: BinaryIO,
+    abs_epsilon: Optional[float] = None,
+    rel_epsilon: Optional[float] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    context: int = DEFAULT_CONTEXT
+) -> Comparison:
+    """Compare two outputs token by token, ignoring how they are spaced.
+
+    When either epsilon is given, tokens that both parse as numbers also match
+    if they differ by at most ``abs_epsilon`` or by at most ``rel_epsilon``
+    times the expected value. Like ``compare_output``, both streams are read
+    in chunks and the scan stops at the first mismatching token.
+    """
+    left = _Tokenizer(expected, chunk_size)
+    right = _Tokenizer(actual, chunk_size)
+    numeric = abs_epsilon is not None or rel_epsilon is not None
+    
+    for expected_token, actual_token in zip_longest(left, right):
+        if expected_token == actual_token:
+            continue
+        if numeric and expected_token is not None and actual_token is not None \
+                and _close(expected_token, actual_token, abs_epsilon, rel_epsilon):
+            continue
+        
+        if actual_token is not None:
+            offset, line, column = right.token_offset, right.token_line, right.token_column
+        else:
+            offset, line, column = right.offset, right.line, right.column
+        return Comparison(
+            equal=False,
+            offset=offset,
+            line=line,
+            column=column,
+            expected_excerpt=_excerpt(expected_token, context),
+            actual_excerpt=_excerpt(actual_token, context)
+        )
+    
+    return Comparison(equal=True)
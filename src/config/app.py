@@ -8,21 +8,72 @@ class AppConfig:
     HOST = os.getenv('HOST', '0.0.0.0')
     PORT = int(os.getenv('PORT', '8000'))
     
+    EXECUTOR_BACKEND = os.getenv('EXECUTOR_BACKEND', 'docker')
+    LOCAL_CGROUP_ROOT = os.getenv('LOCAL_CGROUP_ROOT', '')
+    LOCAL_NPROC_LIMIT = int(os.getenv('LOCAL_NPROC_LIMIT', '64'))
+    LOCAL_ISOLATE_NAMESPACES = os.getenv('LOCAL_ISOLATE_NAMESPACES', 'True').lower() == 'true'
+    
     DOCKER_CPP_IMAGE = os.getenv('DOCKER_CPP_IMAGE', 'adaptivejudge-cpp:latest')
     DOCKER_PYTHON_IMAGE = os.getenv('DOCKER_PYTHON_IMAGE', 'adaptivejudge-python:latest')
     DOCKER_TIMEOUT = int(os.getenv('DOCKER_TIMEOUT', '30'))
     DOCKER_MEMORY_LIMIT = os.getenv('DOCKER_MEMORY_LIMIT', '128m')
+    COMPILE_MEMORY_LIMIT = int(os.getenv('COMPILE_MEMORY_LIMIT', '512'))
+    DOCKER_API_TIMEOUT = int(os.getenv('DOCKER_API_TIMEOUT', '120'))
+    DOCKER_MAX_POOL_SIZE = int(os.getenv('DOCKER_MAX_POOL_SIZE', '32'))
+    
+    CONTAINER_POOL_SIZE = int(os.getenv('CONTAINER_POOL_SIZE', '8'))
+    CONTAINER_POOL_MAX_USES = int(os.getenv('CONTAINER_POOL_MAX_USES', '50'))
+    CONTAINER_POOL_ACQUIRE_TIMEOUT = float(os.getenv('CONTAINER_POOL_ACQUIRE_TIMEOUT', '30'))
     
     DEFAULT_TIME_LIMIT = float(os.getenv('DEFAULT_TIME_LIMIT', '1.0'))
     DEFAULT_MEMORY_LIMIT = int(os.getenv('DEFAULT_MEMORY_LIMIT', '128'))
     MAX_SOURCE_CODE_SIZE = int(os.getenv('MAX_SOURCE_CODE_SIZE', '64000'))
+    OUTPUT_LIMIT = int(os.getenv('OUTPUT_LIMIT', str(16 * 1024 * 1024)))
+    OUTPUT_DIFF_MAX_BYTES = int(os.getenv('OUTPUT_DIFF_MAX_BYTES', '4096'))
+    OUTPUT_DIFF_MAX_LINES = int(os.getenv('OUTPUT_DIFF_MAX_LINES', '10'))
+    OUTPUT_DIFF_CONTEXT = int(os.getenv('OUTPUT_DIFF_CONTEXT', '2'))
+    CHECKER_TIME_LIMIT = float(os.getenv('CHECKER_TIME_LIMIT', '10.0'))
+    CHECKER_MEMORY_LIMIT = int(os.getenv('CHECKER_MEMORY_LIMIT', '256'))
+    
+    JUDGE_WORKERS = int(os.getenv('JUDGE_WORKERS', '2'))
+    JUDGE_SYNC_TIMEOUT = float(os.getenv('JUDGE_SYNC_TIMEOUT', '60'))
+    PARALLEL_TEST_WORKERS = int(os.getenv('PARALLEL_TEST_WORKERS', '4'))
+    EXECUTION_BATCH_SIZE = int(os.getenv('EXECUTION_BATCH_SIZE', '25'))
+    EXECUTION_WALL_BUDGET = float(os.getenv('EXECUTION_WALL_BUDGET', '60'))
+    RESULT_WRITER_ENABLED = os.getenv('RESULT_WRITER_ENABLED', 'True').lower() == 'true'
+    RESULT_WRITER_BATCH_SIZE = int(os.getenv('RESULT_WRITER_BATCH_SIZE', '32'))
+    RESULT_WRITER_MAX_DELAY = float(os.getenv('RESULT_WRITER_MAX_DELAY', '0.005'))
+    EXECUTION_CPUS = float(os.getenv('EXECUTION_CPUS', '1.0'))
+    TEST_ORDERING_ENABLED = os.getenv('TEST_ORDERING_ENABLED', 'True').lower() == 'true'
+    TEST_ORDERING_MIN_RUNS = int(os.getenv('TEST_ORDERING_MIN_RUNS', '5'))
+    VERDICT_CACHE_ENABLED = os.getenv('VERDICT_CACHE_ENABLED', 'True').lower() == 'true'
+    
+    CPU_PINNING_ENABLED = os.getenv('CPU_PINNING_ENABLED', 'True').lower() == 'true'
+    JUDGE_CPUS = os.getenv('JUDGE_CPUS', '')
+    CPU_ISOLATE_SMT = os.getenv('CPU_ISOLATE_SMT', 'False').lower() == 'true'
+    CPU_ACQUIRE_TIMEOUT = float(os.getenv('CPU_ACQUIRE_TIMEOUT', '60'))
+    CGROUP_ROOT = os.getenv('CGROUP_ROOT', '/sys/fs/cgroup')
+    SUPERVISOR_PATH = os.getenv('SUPERVISOR_PATH', '/usr/local/bin/judge-supervisor')
+    WALL_TIME_LIMIT_FACTOR = float(os.getenv('WALL_TIME_LIMIT_FACTOR', '2.0'))
     
     BENCHMARK_REPETITIONS = int(os.getenv('BENCHMARK_REPETITIONS', '5'))
     BENCHMARK_FACTOR_CAP = float(os.getenv('BENCHMARK_FACTOR_CAP', '12.0'))
     BENCHMARK_MIN_FACTOR = float(os.getenv('BENCHMARK_MIN_FACTOR', '1.0'))
     BENCHMARK_STABILITY_THRESHOLD = float(os.getenv('BENCHMARK_STABILITY_THRESHOLD', '0.1'))
     
+    COMPILATION_CACHE_ENABLED = os.getenv('COMPILATION_CACHE_ENABLED', 'True').lower() == 'true'
+    COMPILATION_CACHE_DIR = os.getenv('COMPILATION_CACHE_DIR', 'data/compilation_cache')
+    COMPILATION_CACHE_MAX_BYTES = int(os.getenv('COMPILATION_CACHE_MAX_BYTES', str(512 * 1024 * 1024)))
+    
     TEMP_DIR = os.getenv('TEMP_DIR', '/tmp/adaptive-judge')
+    TEST_DATA_DIR = os.getenv('TEST_DATA_DIR', 'data/test_data')
+    TEST_DATA_HOST_DIR = os.getenv('TEST_DATA_HOST_DIR', '')
+    ANSWER_DATA_DIR = os.getenv('ANSWER_DATA_DIR', 'data/answers')
+    PAYLOAD_DATA_DIR = os.getenv('PAYLOAD_DATA_DIR', 'data/payloads')
+    WORKSPACE_DIR = os.getenv(
+        'WORKSPACE_DIR', '/dev/shm/adaptive-judge' if os.path.isdir('/dev/shm') else '/tmp/adaptive-judge/workspaces'
+    )
+    CONTAINER_TMPFS_SIZE = int(os.getenv('CONTAINER_TMPFS_SIZE', '64'))
     REFERENCE_SOLUTIONS_DIR = os.getenv('REFERENCE_SOLUTIONS_DIR', 'data/reference_solutions')
     PROBLEMS_DATA_DIR = os.getenv('PROBLEMS_DATA_DIR', 'data/problems')
     
@@ -34,6 +85,7 @@ class AppConfig:
         config = {
             'SECRET_KEY': cls.SECRET_KEY,
             'DEBUG': cls.DEBUG,
+            'JUDGE_SYNC_TIMEOUT': cls.JUDGE_SYNC_TIMEOUT,
         }
         config.update(DatabaseConfig.get_config())
         
@@ -43,8 +95,13 @@ class AppConfig:
     def init_directories(cls):
         directories = [
             cls.TEMP_DIR,
+            cls.WORKSPACE_DIR,
+            cls.TEST_DATA_DIR,
+            cls.ANSWER_DATA_DIR,
+            cls.PAYLOAD_DATA_DIR,
             cls.REFERENCE_SOLUTIONS_DIR,
             cls.PROBLEMS_DATA_DIR,
+            cls.COMPILATION_CACHE_DIR,
             os.path.dirname(cls.LOG_FILE) if cls.LOG_FILE else None
         ]
         
@@ -73,6 +130,7 @@ class TestingConfig(AppConfig):
             'SECRET_KEY': 'test-secret-key',
             'DEBUG': cls.DEBUG,
             'TESTING': cls.TESTING,
+            'JUDGE_SYNC_TIMEOUT': cls.JUDGE_SYNC_TIMEOUT,
         }
         config.update(TestDatabaseConfig.get_config())
         
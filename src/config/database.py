@@ -1,9 +1,20 @@
 import os
 from urllib.parse import quote_plus
 
+from sqlalchemy import event
+
 
 class DatabaseConfig:
     
+    # SQLite profile, applied to every connection the engine opens. WAL lets
+    # readers run alongside the single writer, and the busy timeout makes
+    # writers wait for the lock instead of failing with "database is locked".
+    SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT = int(os.getenv('SQLITE_BUSY_TIMEOUT', '30000'))  # milliseconds
+    SQLITE_CACHE_SIZE = int(os.getenv('SQLITE_CACHE_SIZE', str(64 * 1024)))  # KiB
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))  # bytes
+    
     @staticmethod
     def get_database_uri():
         db_host = os.getenv('DB_HOST', 'localhost')
@@ -21,6 +32,24 @@ class DatabaseConfig:
         
         return f'sqlite:///{sqlite_path}'
     
+    @classmethod
+    def configure_engine(cls, engine):
+        if engine.dialect.name == 'sqlite':
+            event.listen(engine, 'connect', cls._apply_sqlite_pragmas)
+    
+    @classmethod
+    def _apply_sqlite_pragmas(cls, dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f'PRAGMA journal_mode={cls.SQLITE_JOURNAL_MODE}')
+            cursor.execute(f'PRAGMA synchronous={cls.SQLITE_SYNCHRONOUS}')
+            cursor.execute(f'PRAGMA busy_timeout={cls.SQLITE_BUSY_TIMEOUT:d}')
+            # A negative cache_size is a size in KiB rather than in pages.
+            cursor.execute(f'PRAGMA cache_size=-{cls.SQLITE_CACHE_SIZE:d}')
+            cursor.execute(f'PRAGMA mmap_size={cls.SQLITE_MMAP_SIZE:d}')
+        finally:
+            cursor.close()
+    
     @staticmethod
     def get_config():
         return {
@@ -1,4 +1,9 @@
 from executor.docker_executor import DockerExecutor
+from executor.local_executor import LocalExecutor
 from executor.execution_result import ExecutionResult, ExecutionStatus
+from executor.prepared_program import PreparedProgram
+from executor.factory import create_executor
+from executor.test_data_store import StoredInput, TestDataStore, get_answer_store, get_test_data_store
 
-__all__ = ['DockerExecutor', 'ExecutionResult', 'ExecutionStatus']
+__all__ = ['DockerExecutor', 'LocalExecutor', 'ExecutionResult', 'ExecutionStatus', 'PreparedProgram', 'create_executor',
+           'StoredInput', 'TestDataStore', 'get_answer_store', 'get_test_data_store']
@@ -0,0 +1,102 @@
+import logging
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CgroupUsage:
+    
+    cpu_time: float
+    memory_peak: Optional[int]
+    oom_killed: bool
+
+
+class CgroupMonitor:
+    """Reads a container's cgroup v2 accounting around a single execution.
+
+    Pooled containers serve many runs, so CPU time and OOM kills are reported
+    as deltas between ``start`` and ``stop``. ``memory.peak`` is reset through
+    its file descriptor where the kernel supports it (Linux 6.12+); otherwise
+    the peak is only reported for a container's first run.
+    """
+    
+    def __init__(self, path: str, fresh: bool):
+        self.path = path
+        self.fresh = fresh
+        
+        self._cpu_usec = 0
+        self._oom_kills = 0
+        self._peak_fd = None
+        self._peak_reset = False
+    
+    @classmethod
+    def for_container(cls, cgroup_root: str, container_id: str, fresh: bool) -> Optional['CgroupMonitor']:
+        candidates = [
+            os.path.join(cgroup_root, 'system.slice', f'docker-{container_id}.scope'),
+            os.path.join(cgroup_root, 'docker', container_id),
+            os.path.join(cgroup_root, 'docker', f'{container_id}.scope'),
+        ]
+        for path in candidates:
+            if os.path.exists(os.path.join(path, 'cpu.stat')):
+                return cls(path, fresh)
+        return None
+    
+    def start(self):
+        self._cpu_usec = self._read_cpu_usec()
+        self._oom_kills = self._read_oom_kills()
+        
+        try:
+            self._peak_fd = os.open(os.path.join(self.path, 'memory.peak'), os.O_RDWR)
+            os.write(self._peak_fd, b'reset\n')
+            self._peak_reset = True
+        except OSError:
+            self._peak_reset = False
+            if self._peak_fd is None:
+                try:
+                    self._peak_fd = os.open(os.path.join(self.path, 'memory.peak'), os.O_RDONLY)
+                except OSError:
+                    self._peak_fd = None
+    
+    def cpu_time(self) -> float:
+        """CPU time used since ``start``, while the execution is still running."""
+        return (self._read_cpu_usec() - self._cpu_usec) / 1_000_000
+    
+    def stop(self) -> CgroupUsage:
+        try:
+            cpu_time = (self._read_cpu_usec() - self._cpu_usec) / 1_000_000
+            oom_killed = self._read_oom_kills() > self._oom_kills
+            
+            memory_peak = None
+            if self._peak_fd is not None and (self._peak_reset or self.fresh):
+                os.lseek(self._peak_fd, 0, os.SEEK_SET)
+                memory_peak = int(os.read(self._peak_fd, 64).strip())
+            
+            return CgroupUsage(cpu_time=cpu_time, memory_peak=memory_peak, oom_killed=oom_killed)
+        finally:
+            if self._peak_fd is not None:
+                os.close(self._peak_fd)
+                self._peak_fd = None
+    
+    def _read_cpu_usec(self) -> int:
+        stats = self._read_keyed(os.path.join(self.path, 'cpu.stat'))
+        return stats.get('user_usec', 0) + stats.get('system_usec', 0)
+    
+    def _read_oom_kills(self) -> int:
+        return self._read_keyed(os.path.join(self.path, 'memory.events')).get('oom_kill', 0)
+    
+    @staticmethod
+    def _read_keyed(path: str) -> dict:
+        values = {}
+        try:
+            with open(path, 'r') as f:
+                for line in f:
+                    key, _, value = line.partition(' ')
+                    if value.strip().isdigit():
+                        values[key] = int(value)
+        except OSError as e:
+            logger.debug(f"Cannot read {path}: {e}")
+        return values
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from .execution_result import ExecutionResult, ExecutionStatus
+
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FILE = 'artifact'
+META_FILE = 'meta.json'
+
+
+class CompilationCache:
+    """Host-side store of compiled binaries and compiler diagnostics.
+
+    Entries are keyed by sha256 over the source, the compile command and the
+    resolved image digest, and evicted least-recently-used once the cache
+    grows past ``max_bytes``.
+    """
+    
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        
+        os.makedirs(root, exist_ok=True)
+        self._load_index()
+    
+    @staticmethod
+    def make_key(source_code: str, compile_cmd: str, image_digest: str) -> str:
+        digest = hashlib.sha256()
+        for part in (source_code, compile_cmd, image_digest):
+            encoded = part.encode('utf-8')
+            digest.update(len(encoded).to_bytes(8, 'big'))
+            digest.update(encoded)
+        return digest.hexdigest()
+    
+    def get(self, key: str, artifact_destination: str) -> Optional[ExecutionResult]:
+        entry_dir = os.path.join(self.root, key)
+        
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+        
+        try:
+            with open(os.path.join(entry_dir, META_FILE), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            
+            artifact = os.path.join(entry_dir, ARTIFACT_FILE)
+            if os.path.exists(artifact):
+                shutil.copy2(artifact, artifact_destination)
+            os.utime(entry_dir)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable compilation cache entry {key}: {e}")
+            self._evict(key)
+            with self._lock:
+                self.misses += 1
+            return None
+        
+        with self._lock:
+            self.hits += 1
+        
+        return ExecutionResult(
+            status=ExecutionStatus(meta['status']),
+            exit_code=meta['exit_code'],
+            execution_time=meta['execution_time'],
+            stdout=meta.get('stdout', ''),
+            stderr=meta.get('stderr', ''),
+            error_message=meta.get('error_message')
+        )
+    
+    def put(self, key: str, compilation: ExecutionResult, artifact_path: Optional[str] = None):
+        staging = tempfile.mkdtemp(prefix='.staging-', dir=self.root)
+        try:
+            if artifact_path:
+                shutil.copy2(artifact_path, os.path.join(staging, ARTIFACT_FILE))
+            with open(os.path.join(staging, META_FILE), 'w', encoding='utf-8') as f:
+                json.dump({
+                    'status': compilation.status.value,
+                    'exit_code': compilation.exit_code,
+                    'execution_time': compilation.execution_time,
+                    'stdout': compilation.stdout,
+                    'stderr': compilation.stderr,
+                    'error_message': compilation.error_message
+                }, f)
+            
+            size = self._dir_size(staging)
+            os.rename(staging, os.path.join(self.root, key))
+        except OSError:
+            # Another worker stored the same key first, or the cache is unwritable.
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+        
+        with self._lock:
+            self._entries[key] = size
+            self._total_bytes += size
+            victims = []
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                victim, victim_size = self._entries.popitem(last=False)
+                self._total_bytes -= victim_size
+                victims.append(victim)
+        
+        for victim in victims:
+            shutil.rmtree(os.path.join(self.root, victim), ignore_errors=True)
+    
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes
+            }
+    
+    def _evict(self, key: str):
+        with self._lock:
+            size = self._entries.pop(key, None)
+            if size is not None:
+                self._total_bytes -= size
+        shutil.rmtree(os.path.join(self.root, key), ignore_errors=True)
+    
+    def _load_index(self):
+        entries = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name.startswith('.staging-'):
+                shutil.rmtree(path, ignore_errors=True)
+            elif os.path.isdir(path):
+                entries.append((os.path.getmtime(path), name, self._dir_size(path)))
+        
+        for _, name, size in sorted(entries):
+            self._entries[name] = size
+            self._total_bytes += size
+    
+    @staticmethod
+    def _dir_size(path: str) -> int:
+        return sum(
+            os.path.getsize(os.path.join(path, name))
+            for name in os.listdir(path)
+        )
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_compilation_cache(config) -> Optional[CompilationCache]:
+    global _cache
+    
+    if not config.COMPILATION_CACHE_ENABLED:
+        return None
+    
+    with _cache_lock:
+        if _cache is None:
+            _cache = CompilationCache(config.COMPILATION_CACHE_DIR, config.COMPILATION_CACHE_MAX_BYTES)
+        return _cache
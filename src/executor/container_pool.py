@@ -0,0 +1,269 @@
+import atexit
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from .docker_client import get_docker_client
+from .test_data_store import CONTAINER_MOUNT, get_test_data_store
+
+
+logger = logging.getLogger(__name__)
+
+POOL_LABEL = 'adaptive-judge.pool'
+
+# Scratch directories are tmpfs mounts, so they are emptied rather than removed.
+SCRATCH_DIRS = ('/workspace', '/program', '/tmp')
+
+RESET_CMD = (
+    'kill -9 -1 2>/dev/null; '
+    f'find {" ".join(SCRATCH_DIRS)} -mindepth 1 -delete 2>/dev/null; '
+    'true'
+)
+
+
+class PooledContainer:
+    
+    def __init__(self, container, memory_limit: int):
+        self.container = container
+        self.memory_limit = memory_limit
+        self.uses = 0
+        self.created_at = time.time()
+    
+    @property
+    def id(self) -> str:
+        return self.container.id
+    
+    @property
+    def short_id(self) -> str:
+        return self.container.short_id
+
+
+class ContainerPool:
+    """Pre-created, network-disabled containers for one image.
+
+    Containers idle on ``sleep infinity`` and executions are issued through
+    ``docker exec``. The memory limit is set per acquire with ``docker
+    update``, so one pool serves compilations, checkers and every problem's
+    limit. Scratch directories are size-limited tmpfs mounts, so runs never
+    touch the container's disk layer. A container is reset after every use
+    and recycled once it has served ``max_uses`` executions or fails a health
+    check. With ``size`` set to 0 every acquire creates a throwaway container.
+    """
+    
+    def __init__(
+        self,
+        client_provider: Callable,
+        image: str,
+        default_memory_limit: int,
+        cpus: float,
+        size: int,
+        max_uses: int,
+        acquire_timeout: float,
+        tmpfs_size: int,
+        volumes: Optional[Dict] = None
+    ):
+        self.client_provider = client_provider
+        self.image = image
+        self.default_memory_limit = default_memory_limit
+        self.cpus = cpus
+        self.size = size
+        self.max_uses = max_uses
+        self.acquire_timeout = acquire_timeout
+        self.tmpfs_size = tmpfs_size
+        self.volumes = volumes
+        
+        self._idle: List[PooledContainer] = []
+        self._total = 0
+        self._closed = False
+        self._condition = threading.Condition()
+    
+    @property
+    def client(self):
+        return self.client_provider()
+    
+    def warm_up(self):
+        with self._condition:
+            missing = self.size - self._total
+            self._total += max(missing, 0)
+        
+        created = []
+        for _ in range(max(missing, 0)):
+            try:
+                created.append(self._create())
+            except Exception as e:
+                logger.error(f"Failed to pre-create container for {self.image}: {e}")
+                with self._condition:
+                    self._total -= 1
+        
+        with self._condition:
+            self._idle.extend(created)
+            self._condition.notify_all()
+        
+        if created:
+            logger.info(f"Warmed {len(created)} containers for {self.image}")
+    
+    def acquire(self, memory_limit: int) -> PooledContainer:
+        deadline = time.time() + self.acquire_timeout
+        
+        while True:
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("Container pool is closed")
+                
+                if self._idle:
+                    pooled = self._idle.pop()
+                elif self._total < self.size or self.size == 0:
+                    self._total += 1
+                    pooled = None
+                else:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise RuntimeError(f"No container available for {self.image} after {self.acquire_timeout}s")
+                    self._condition.wait(remaining)
+                    continue
+            
+            if pooled is None:
+                try:
+                    return self._create(memory_limit)
+                except Exception:
+                    with self._condition:
+                        self._total -= 1
+                        self._condition.notify()
+                    raise
+            
+            if self._is_healthy(pooled) and self._set_memory_limit(pooled, memory_limit):
+                return pooled
+            
+            self._discard(pooled)
+    
+    def release(self, pooled: PooledContainer, healthy: bool = True):
+        pooled.uses += 1
+        
+        reusable = (
+            healthy
+            and self.size > 0
+            and not self._closed
+            and pooled.uses < self.max_uses
+            and self._reset(pooled)
+        )
+        
+        if reusable:
+            with self._condition:
+                self._idle.append(pooled)
+                self._condition.notify()
+        else:
+            self._discard(pooled)
+    
+    def close(self):
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        
+        for pooled in idle:
+            self._discard(pooled)
+    
+    def _create(self, memory_limit: int = None) -> PooledContainer:
+        memory_limit = memory_limit or self.default_memory_limit
+        container = self.client.containers.run(
+            image=self.image,
+            command=['sleep', 'infinity'],
+            working_dir='/workspace',
+            mem_limit=f'{memory_limit}m',
+            memswap_limit=f'{memory_limit}m',
+            nano_cpus=int(self.cpus * 1e9) if self.cpus > 0 else None,
+            oom_kill_disable=False,
+            network_disabled=True,
+            tmpfs={path: f'size={self.tmpfs_size}m,mode=1777' for path in SCRATCH_DIRS},
+            volumes=self.volumes,
+            labels={POOL_LABEL: self.image},
+            detach=True
+        )
+        pooled = PooledContainer(container, memory_limit)
+        if not self._reset(pooled):
+            container.remove(force=True)
+            raise RuntimeError(f"Failed to initialise container for {self.image}")
+        return pooled
+    
+    def _is_healthy(self, pooled: PooledContainer) -> bool:
+        try:
+            pooled.container.reload()
+            return pooled.container.status == 'running'
+        except Exception:
+            return False
+    
+    def _set_memory_limit(self, pooled: PooledContainer, memory_limit: int) -> bool:
+        if pooled.memory_limit == memory_limit:
+            return True
+        try:
+            # Swap is capped at the same value, so the limit stays a hard one.
+            pooled.container.update(mem_limit=f'{memory_limit}m', memswap_limit=f'{memory_limit}m')
+        except Exception as e:
+            logger.warning(f"Failed to set memory limit of container {pooled.short_id}: {e}")
+            return False
+        pooled.memory_limit = memory_limit
+        return True
+    
+    def _reset(self, pooled: PooledContainer) -> bool:
+        try:
+            exit_code, _ = pooled.container.exec_run(['sh', '-c', RESET_CMD])
+            return exit_code == 0
+        except Exception as e:
+            logger.warning(f"Failed to reset container {pooled.short_id}: {e}")
+            return False
+    
+    def _discard(self, pooled: PooledContainer):
+        try:
+            pooled.container.remove(force=True)
+        except Exception:
+            pass
+        
+        with self._condition:
+            self._total -= 1
+            self._condition.notify()
+
+
+_pools: Dict[str, ContainerPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_container_pool(image: str, config) -> ContainerPool:
+    # The bind source is resolved by the Docker daemon, which may see the
+    # store under a different path when the judge itself runs in a container.
+    test_data_source = config.TEST_DATA_HOST_DIR or get_test_data_store(config).root
+    
+    with _pools_lock:
+        pool = _pools.get(image)
+        if pool is None:
+            pool = ContainerPool(
+                client_provider=lambda: get_docker_client(config),
+                image=image,
+                default_memory_limit=config.DEFAULT_MEMORY_LIMIT,
+                cpus=config.EXECUTION_CPUS,
+                size=config.CONTAINER_POOL_SIZE,
+                max_uses=config.CONTAINER_POOL_MAX_USES,
+                acquire_timeout=config.CONTAINER_POOL_ACQUIRE_TIMEOUT,
+                tmpfs_size=config.CONTAINER_TMPFS_SIZE,
+                volumes={test_data_source: {'bind': CONTAINER_MOUNT, 'mode': 'ro'}}
+            )
+            _pools[image] = pool
+            created = True
+        else:
+            created = False
+    
+    if created:
+        pool.warm_up()
+    return pool
+
+
+def close_container_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(close_container_pools)
@@ -0,0 +1,158 @@
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+
+logger = logging.getLogger(__name__)
+
+SYSFS_CPU_DIR = '/sys/devices/system/cpu'
+
+
+def parse_cpu_list(value: str) -> List[int]:
+    cpus = set()
+    for part in value.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start, end = part.split('-', 1)
+            cpus.update(range(int(start), int(end) + 1))
+        else:
+            cpus.add(int(part))
+    return sorted(cpus)
+
+
+def format_cpu_list(cpus: List[int]) -> str:
+    return ','.join(str(cpu) for cpu in sorted(cpus))
+
+
+def read_smt_siblings(cpus: List[int]) -> Dict[int, Set[int]]:
+    siblings = {}
+    for cpu in cpus:
+        path = os.path.join(SYSFS_CPU_DIR, f'cpu{cpu}', 'topology', 'thread_siblings_list')
+        try:
+            with open(path, 'r') as f:
+                siblings[cpu] = set(parse_cpu_list(f.read()))
+        except (OSError, ValueError):
+            siblings[cpu] = {cpu}
+    return siblings
+
+
+@dataclass
+class CpuLease:
+    
+    cpu: int
+    reserved: List[int]
+    
+    @property
+    def cpuset(self) -> str:
+        return str(self.cpu)
+
+
+class CpuAllocator:
+    """Hands out dedicated logical CPUs from the reserved judge set.
+
+    An isolated lease reserves every SMT sibling of the chosen core, leaving
+    the other hardware threads idle so the pinned run does not share
+    execution units with another judge run. Leases are held for one bounded
+    run, so waiting for a CPU is backpressure rather than a failure: a wait
+    longer than ``acquire_timeout`` is logged and the caller keeps waiting.
+    """
+    
+    def __init__(self, cpus: List[int], siblings: Dict[int, Set[int]], isolate_smt: bool, acquire_timeout: float):
+        if not cpus:
+            raise ValueError("CPU allocator needs at least one CPU")
+        
+        self.cpus = sorted(cpus)
+        self.isolate_smt = isolate_smt
+        self.acquire_timeout = acquire_timeout
+        # Siblings outside the reserved set are never handed out, so they are
+        # ignored when checking whether a physical core is fully idle.
+        self.siblings = {cpu: (siblings.get(cpu, {cpu}) & set(cpus)) | {cpu} for cpu in cpus}
+        
+        self._busy: Set[int] = set()
+        self._condition = threading.Condition()
+    
+    def acquire(self, isolated: bool = False) -> CpuLease:
+        isolated = isolated or self.isolate_smt
+        lease = None
+        
+        def available() -> bool:
+            nonlocal lease
+            lease = self._try_acquire(isolated)
+            return lease is not None
+        
+        with self._condition:
+            if not self._condition.wait_for(available, timeout=self.acquire_timeout):
+                logger.warning(f"No {'isolated ' if isolated else ''}CPU free after {self.acquire_timeout}s, still waiting")
+                self._condition.wait_for(available)
+            
+            self._busy.update(lease.reserved)
+            return lease
+    
+    def release(self, lease: Optional[CpuLease]):
+        if lease is None:
+            return
+        
+        with self._condition:
+            self._busy.difference_update(lease.reserved)
+            self._condition.notify_all()
+    
+    def unreserved_cpuset(self) -> str:
+        online = sorted(os.sched_getaffinity(0))
+        unreserved = [cpu for cpu in online if cpu not in self.cpus]
+        return format_cpu_list(unreserved or online)
+    
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                'cpus': format_cpu_list(self.cpus),
+                'busy': format_cpu_list(list(self._busy)),
+                'isolate_smt': self.isolate_smt
+            }
+    
+    def _try_acquire(self, isolated: bool) -> Optional[CpuLease]:
+        free = [cpu for cpu in self.cpus if cpu not in self._busy]
+        
+        if isolated:
+            for cpu in free:
+                if not self.siblings[cpu] & self._busy:
+                    return CpuLease(cpu=cpu, reserved=sorted(self.siblings[cpu]))
+            return None
+        
+        if not free:
+            return None
+        
+        # Prefer CPUs whose siblings are idle so concurrent runs spread across
+        # physical cores before doubling up on hyper-threads.
+        cpu = min(free, key=lambda c: (len(self.siblings[c] & self._busy), c))
+        return CpuLease(cpu=cpu, reserved=[cpu])
+
+
+_allocator = None
+_allocator_lock = threading.Lock()
+
+
+def get_cpu_allocator(config) -> Optional[CpuAllocator]:
+    global _allocator
+    
+    if not config.CPU_PINNING_ENABLED:
+        return None
+    
+    with _allocator_lock:
+        if _allocator is None:
+            if config.JUDGE_CPUS:
+                cpus = parse_cpu_list(config.JUDGE_CPUS)
+            else:
+                cpus = sorted(os.sched_getaffinity(0))
+            
+            _allocator = CpuAllocator(
+                cpus=cpus,
+                siblings=read_smt_siblings(cpus),
+                isolate_smt=config.CPU_ISOLATE_SMT,
+                acquire_timeout=config.CPU_ACQUIRE_TIMEOUT
+            )
+            logger.info(f"CPU allocator reserving CPUs {format_cpu_list(cpus)}")
+        return _allocator
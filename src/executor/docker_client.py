@@ -0,0 +1,54 @@
+import logging
+import os
+import threading
+
+import docker
+import requests
+
+
+logger = logging.getLogger(__name__)
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_docker_client(config) -> docker.DockerClient:
+    """Return the process-wide Docker client, connecting on first use.
+
+    The client's HTTP connection pool is shared by every executor, pool and
+    judge thread. A failed connection is not cached, so the next call simply
+    tries again.
+    """
+    global _client
+    
+    with _client_lock:
+        if _client is None:
+            try:
+                os.environ.pop('DOCKER_HOST', None)
+                client = docker.from_env(
+                    timeout=config.DOCKER_API_TIMEOUT,
+                    max_pool_size=config.DOCKER_MAX_POOL_SIZE
+                )
+                client.ping()
+            except Exception as e:
+                logger.error(f"Failed to initialize Docker client: {e}")
+                raise RuntimeError(f"Docker not available: {e}")
+            
+            _client = client
+            logger.info("Docker client initialized")
+        return _client
+
+
+def reset_docker_client():
+    global _client
+    
+    with _client_lock:
+        _client = None
+
+
+def reset_on_connection_error(error: Exception):
+    # Connection-level failures usually mean the daemon restarted; drop the
+    # client so the next call reconnects instead of reusing a dead socket.
+    if isinstance(error, requests.exceptions.ConnectionError):
+        logger.warning(f"Lost connection to Docker daemon, reconnecting on next use: {error}")
+        reset_docker_client()
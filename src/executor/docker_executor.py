@@ -1,11 +1,23 @@
 import docker
+import io
+import json
 import os
+import signal
+import shutil
+import tarfile
 import tempfile
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, List, Tuple, Union
 import logging
 
 from .execution_result import ExecutionResult, ExecutionStatus
+from .prepared_program import PreparedProgram
+from .container_pool import ContainerPool, PooledContainer, get_container_pool
+from .compilation_cache import CompilationCache, get_compilation_cache
+from .cpu_allocator import CpuAllocator, get_cpu_allocator
+from .cgroup_stats import CgroupMonitor
+from .docker_client import get_docker_client, reset_on_connection_error
+from .test_data_store import CONTAINER_MOUNT, StoredInput, TestDataStore, get_answer_store, get_test_data_store
 from config.app import AppConfig
 
 
@@ -14,164 +26,409 @@ logger = logging.getLogger(__name__)
 
 class DockerExecutor:
     
+    # Extra wall time before the container-side timeout kills a run whose
+    # supervisor did not stop it on its own.
+    KILL_GRACE = 1.0
+    
+    # Per-test stdout, stderr and supervisor report are written here.
+    RESULTS_DIR = '/workspace/results'
+    
+    # Exit code of a batch script that stopped early to free tmpfs space.
+    BUDGET_EXHAUSTED = 3
+    
+    # Exit code of a batch script that stopped at the first failing test.
+    STOPPED_ON_FAILURE = 4
+    
+    # Contestant output and expected answer handed to custom checkers.
+    CHECK_DIR = '/workspace/check'
+    
+    # Stdout and stderr of a detached exec, collected once it has exited.
+    EXEC_DIR = '/workspace/.exec'
+    
+    # Exit code of ``timeout -s KILL`` when it had to kill the command.
+    EXEC_KILLED = 128 + signal.SIGKILL
+    
+    # Bounds of the backoff between polls of a running exec, in seconds.
+    EXEC_POLL_MIN = 0.005
+    EXEC_POLL_MAX = 0.05
+    
     def __init__(self, config: AppConfig = None):
         self.config = config or AppConfig()
-        self.client = None
-        self._init_docker_client()
+        self.compilation_cache: Optional[CompilationCache] = get_compilation_cache(self.config)
+        self.cpu_allocator: Optional[CpuAllocator] = get_cpu_allocator(self.config)
+        self.test_data: TestDataStore = get_test_data_store(self.config)
+        self.answers: TestDataStore = get_answer_store(self.config)
     
-    def _init_docker_client(self):
-        try:
-            import subprocess
-            result = subprocess.run(['docker', 'ps'], capture_output=True, text=True, timeout=10)
-            if result.returncode != 0:
-                raise RuntimeError(f"Docker command failed: {result.stderr}")
-            
-            os.environ.pop('DOCKER_HOST', None)
-            self.client = docker.from_env()
-            
-            self.client.ping()
-            logger.info("Docker client initialized")
-        except Exception as e:
-            logger.error(f"Failed to initialize Docker client: {e}")
-            raise RuntimeError(f"Docker not available: {e}")
+    @property
+    def client(self) -> docker.DockerClient:
+        return get_docker_client(self.config)
+    
+    LANGUAGES = {
+        'cpp': {
+            'source_file': 'solution.cpp',
+            'compile_cmd': 'g++ -O2 -o solution solution.cpp',
+            'artifact': 'solution',
+            'run_cmd': '/program/solution',
+        },
+        'python': {
+            'source_file': 'solution.py',
+            'compile_cmd': None,
+            'artifact': None,
+            'run_cmd': 'python3 /program/solution.py',
+        },
+    }
+    
+    def execute_cpp(
+        self, source_code: str, input_data: str, time_limit: float = None, memory_limit: int = None, isolated: bool = False
+    ) -> ExecutionResult:
+        return self._execute_code(self.prepare_cpp(source_code), input_data, time_limit, memory_limit, isolated)
+    
+    def execute_python(
+        self, source_code: str, input_data: str, time_limit: float = None, memory_limit: int = None, isolated: bool = False
+    ) -> ExecutionResult:
+        return self._execute_code(self.prepare_python(source_code), input_data, time_limit, memory_limit, isolated)
     
-    def execute_cpp(self, source_code: str, input_data: str, time_limit: float = None, memory_limit: int = None) -> ExecutionResult:
+    def prepare_cpp(self, source_code: str) -> PreparedProgram:
+        return self._prepare_program(source_code, "cpp", self.config.DOCKER_CPP_IMAGE)
+    
+    def prepare_python(self, source_code: str) -> PreparedProgram:
+        return self._prepare_program(source_code, "python", self.config.DOCKER_PYTHON_IMAGE)
+    
+    def run_prepared(
+        self,
+        program: PreparedProgram,
+        input_data: Union[str, StoredInput],
+        time_limit: float = None,
+        memory_limit: int = None,
+        isolated: bool = False
+    ) -> ExecutionResult:
+        if not program.success:
+            return program.compilation
         if time_limit is None:
             time_limit = self.config.DEFAULT_TIME_LIMIT
         if memory_limit is None:
             memory_limit = self.config.DEFAULT_MEMORY_LIMIT
         
-        return self._execute_code(
-            source_code=source_code,
-            input_data=input_data,
-            time_limit=time_limit,
-            memory_limit=memory_limit,
-            language="cpp",
-            image=self.config.DOCKER_CPP_IMAGE,
-            compile_cmd="g++ -O2 -o solution solution.cpp",
-            run_cmd="./solution"
-        )
+        try:
+            pool = self._get_pool(program.image)
+            files = {'/program': self._read_files(program.workspace)}
+            input_path = self._input_path(input_data)
+            return self._run_batch(pool, files, program.run_cmd, [input_path], time_limit, memory_limit, isolated)[0]
+        
+        except Exception as e:
+            logger.error(f"Execution error: {e}")
+            return ExecutionResult(
+                status=ExecutionStatus.INTERNAL_ERROR,
+                exit_code=-1,
+                execution_time=0.0,
+                error_message=str(e)
+            )
     
-    def execute_python(self, source_code: str, input_data: str, time_limit: float = None, memory_limit: int = None) -> ExecutionResult:
+    def execute_batch(
+        self,
+        program: PreparedProgram,
+        inputs: List[Union[str, StoredInput]],
+        time_limit: float = None,
+        memory_limit: int = None,
+        stop_on_failure: bool = False
+    ) -> List[ExecutionResult]:
+        """Run a prepared program against several inputs in one pooled container.
+
+        The program is copied in once and the tests run back to back under the
+        timing supervisor, reading their inputs from the read-only test data
+        mount; one result is returned per input, in order. With
+        ``stop_on_failure``, inputs after the first run that exits abnormally
+        are not run and come back as ``SKIPPED``.
+        """
+        if not program.success:
+            return [program.compilation for _ in inputs]
+        if not inputs:
+            return []
         if time_limit is None:
             time_limit = self.config.DEFAULT_TIME_LIMIT
         if memory_limit is None:
             memory_limit = self.config.DEFAULT_MEMORY_LIMIT
         
-        return self._execute_code(
-            source_code=source_code,
-            input_data=input_data,
-            time_limit=time_limit,
-            memory_limit=memory_limit,
-            language="python",
-            image=self.config.DOCKER_PYTHON_IMAGE,
-            compile_cmd=None,
-            run_cmd="python3 solution.py"
-        )
+        try:
+            pool = self._get_pool(program.image)
+            files = {'/program': self._read_files(program.workspace)}
+            input_paths = [self._input_path(input_data) for input_data in inputs]
+            return self._run_batch(
+                pool, files, program.run_cmd, input_paths, time_limit, memory_limit, stop_on_failure=stop_on_failure
+            )
+        
+        except Exception as e:
+            logger.error(f"Batch execution error: {e}")
+            return [ExecutionResult(
+                status=ExecutionStatus.INTERNAL_ERROR,
+                exit_code=-1,
+                execution_time=0.0,
+                error_message=str(e)
+            ) for _ in inputs]
+    
+    def run_checker(
+        self,
+        checker: PreparedProgram,
+        input_data: StoredInput,
+        answer: StoredInput,
+        output: str,
+        time_limit: float = None,
+        memory_limit: int = None
+    ) -> ExecutionResult:
+        """Run a compiled custom checker as ``checker <input> <output> <answer>``.
+
+        The input comes from the read-only test data mount like a solution's
+        stdin; the contestant output and the expected answer are copied into
+        the checker's own container, since answers are never mounted.
+        """
+        if not checker.success:
+            return checker.compilation
+        if time_limit is None:
+            time_limit = self.config.CHECKER_TIME_LIMIT
+        if memory_limit is None:
+            memory_limit = self.config.CHECKER_MEMORY_LIMIT
+        
+        try:
+            pool = self._get_pool(checker.image)
+            with open(self.answers.path_for(answer), 'rb') as f:
+                answer_data = f.read()
+            files = {
+                '/program': self._read_files(checker.workspace),
+                '/workspace': {'check/output.txt': output.encode('utf-8'), 'check/answer.txt': answer_data}
+            }
+            input_path = self._input_path(input_data)
+            run_cmd = f'{checker.run_cmd} {input_path} {self.CHECK_DIR}/output.txt {self.CHECK_DIR}/answer.txt'
+            return self._run_batch(pool, files, run_cmd, [input_path], time_limit, memory_limit)[0]
+        
+        except Exception as e:
+            logger.error(f"Checker error: {e}")
+            return ExecutionResult(
+                status=ExecutionStatus.INTERNAL_ERROR,
+                exit_code=-1,
+                execution_time=0.0,
+                error_message=str(e)
+            )
+    
+    def release(self, program: PreparedProgram):
+        if program is not None:
+            self._remove_dir(program.workspace)
     
     def _execute_code(
         self,
-        source_code: str,
+        program: PreparedProgram,
         input_data: str,
         time_limit: float,
         memory_limit: int,
-        language: str,
-        image: str,
-        run_cmd: str,
-        compile_cmd: Optional[str] = None
+        isolated: bool = False
     ) -> ExecutionResult:
+        try:
+            return self.run_prepared(program, input_data, time_limit, memory_limit, isolated)
+        finally:
+            self.release(program)
+    
+    def _prepare_program(self, source_code: str, language: str, image: str) -> PreparedProgram:
+        if language not in self.LANGUAGES:
+            raise ValueError(f"Unsupported language: {language}")
+        spec = self.LANGUAGES[language]
         
-        container = None
-        temp_dir = None
+        os.makedirs(self.config.WORKSPACE_DIR, exist_ok=True)
+        workspace = tempfile.mkdtemp(prefix=f'{language}-', dir=self.config.WORKSPACE_DIR)
+        program = PreparedProgram(
+            language=language,
+            image=image,
+            workspace=workspace,
+            run_cmd=spec['run_cmd'],
+            compilation=ExecutionResult(status=ExecutionStatus.SUCCESS, exit_code=0, execution_time=0.0)
+        )
         
         try:
-            temp_dir = tempfile.mkdtemp(prefix=f'adaptive-judge-{language}-')
-            if language == "cpp":
-                source_file = os.path.join(temp_dir, "solution.cpp")
-            elif language == "python":
-                source_file = os.path.join(temp_dir, "solution.py")
-            else:
-                raise ValueError(f"Unsupported language: {language}")
-            
-            with open(source_file, 'w', encoding='utf-8') as f:
+            with open(os.path.join(workspace, spec['source_file']), 'w', encoding='utf-8') as f:
                 f.write(source_code)
             
-            input_file = os.path.join(temp_dir, "input.txt")
-            with open(input_file, 'w', encoding='utf-8') as f:
-                f.write(input_data)
-            container_config = {
-                'image': image,
-                'working_dir': '/workspace',
-                'volumes': {temp_dir: {'bind': '/workspace', 'mode': 'rw'}},
-                'mem_limit': f'{memory_limit}m',
-                'memswap_limit': f'{memory_limit}m',
-                'oom_kill_disable': False,
-                'network_disabled': True,
-                'detach': True,
-                'stdin_open': True,
-                'remove': True  # Auto-remove container when done
-            }
-            
-            # Compilation step (if needed)
-            if compile_cmd:
-                compilation_result = self._run_compilation(container_config, compile_cmd, time_limit)
-                if not compilation_result.success:
-                    return compilation_result
-            
-            # Execution step
-            return self._run_execution(container_config, run_cmd, time_limit, input_data)
-            
+            if spec['compile_cmd']:
+                program.compilation, program.cached = self._compile(source_code, spec, image, workspace)
+        
         except Exception as e:
-            logger.error(f"Execution error: {e}")
-            return ExecutionResult(
+            logger.error(f"Preparation error: {e}")
+            program.compilation = ExecutionResult(
                 status=ExecutionStatus.INTERNAL_ERROR,
                 exit_code=-1,
                 execution_time=0.0,
                 error_message=str(e)
             )
-        finally:
-            # Cleanup
-            if container:
-                try:
-                    container.stop(timeout=1)
-                    container.remove()
-                except:
-                    pass
-            
-            if temp_dir and os.path.exists(temp_dir):
-                try:
-                    import shutil
-                    shutil.rmtree(temp_dir)
-                except:
-                    pass
+        
+        return program
     
-    def _run_compilation(self, container_config: Dict[str, Any], compile_cmd: str, time_limit: float) -> ExecutionResult:
-        """Run compilation step."""
-        try:
-            # Create container for compilation
-            container = self.client.containers.run(
-                command=['sh', '-c', compile_cmd],
-                **container_config
+    def _compile(self, source_code: str, spec: Dict, image: str, workspace: str) -> Tuple[ExecutionResult, bool]:
+        artifact_path = os.path.join(workspace, spec['artifact'])
+        
+        cache_key = None
+        if self.compilation_cache is not None:
+            cache_key = CompilationCache.make_key(source_code, spec['compile_cmd'], self._image_digest(image))
+            cached = self.compilation_cache.get(cache_key, artifact_path)
+            if cached is not None:
+                logger.debug(f"Compilation cache hit {cache_key[:12]}")
+                return cached, True
+        
+        pool = self._get_pool(image)
+        compilation = self._run_compilation(
+            pool, workspace, spec['compile_cmd'], spec['artifact'], self.config.DOCKER_TIMEOUT,
+            self.config.COMPILE_MEMORY_LIMIT
+        )
+        if compilation.success:
+            logger.info(f"Compiled program in {compilation.execution_time:.2f}s")
+        
+        # Only deterministic outcomes are cached; timeouts and infrastructure
+        # failures are retried on the next submission.
+        cacheable = compilation.success or (
+            compilation.status == ExecutionStatus.COMPILATION_ERROR
+            and compilation.execution_time < self.config.DOCKER_TIMEOUT
+        )
+        if cache_key and cacheable:
+            self.compilation_cache.put(
+                cache_key, compilation, artifact_path if compilation.success else None
             )
-            
-            # Wait for compilation with timeout
-            start_time = time.time()
+        
+        return compilation, False
+    
+    def _image_digest(self, image: str) -> str:
+        return self.client.images.get(image).id
+    
+    def _input_path(self, input_data: Union[str, StoredInput]) -> str:
+        if isinstance(input_data, str):
+            input_data = self.test_data.put(input_data)
+        return f'{CONTAINER_MOUNT}/{input_data.relative_path}'
+    
+    def _get_pool(self, image: str) -> ContainerPool:
+        return get_container_pool(image, self.config)
+    
+    def _read_files(self, directory: str) -> Dict[str, bytes]:
+        files = {}
+        for name in os.listdir(directory):
+            with open(os.path.join(directory, name), 'rb') as f:
+                files[name] = f.read()
+        return files
+    
+    def _put_files(self, pooled: PooledContainer, destination: str, files: Dict[str, bytes]):
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode='w') as tar:
+            for directory in sorted({os.path.dirname(name) for name in files if os.path.dirname(name)}):
+                info = tarfile.TarInfo(name=directory)
+                info.type = tarfile.DIRTYPE
+                info.mode = 0o755
+                info.mtime = int(time.time())
+                tar.addfile(info)
+            for name, data in files.items():
+                info = tarfile.TarInfo(name=name)
+                info.size = len(data)
+                info.mode = 0o755
+                info.mtime = int(time.time())
+                tar.addfile(info, io.BytesIO(data))
+        
+        if not pooled.container.put_archive(destination, buffer.getvalue()):
+            raise RuntimeError(f"Failed to copy files into container {pooled.short_id}")
+    
+    def _get_file(self, pooled: PooledContainer, path: str) -> Optional[bytes]:
+        try:
+            bits, _ = pooled.container.get_archive(path)
+        except docker.errors.NotFound:
+            return None
+        
+        with tarfile.open(fileobj=io.BytesIO(b''.join(bits)), mode='r') as tar:
+            member = tar.next()
+            return tar.extractfile(member).read() if member else None
+    
+    def _get_dir(self, pooled: PooledContainer, path: str) -> Dict[str, bytes]:
+        try:
+            bits, _ = pooled.container.get_archive(path)
+        except docker.errors.NotFound:
+            return {}
+        
+        files = {}
+        with tarfile.open(fileobj=io.BytesIO(b''.join(bits)), mode='r') as tar:
+            for member in tar:
+                if member.isfile():
+                    files[os.path.basename(member.name)] = tar.extractfile(member).read()
+        return files
+    
+    @staticmethod
+    def _tmpfs_kb(contents) -> int:
+        # tmpfs charges whole pages for every file.
+        return sum(-(-len(data) // 4096) * 4 for data in contents)
+    
+    def _parse_report(self, data: Optional[bytes], pooled: PooledContainer) -> Optional[Dict]:
+        if not data:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            logger.warning(f"Unparsable supervisor report in {pooled.short_id}: {data[:200]!r}")
+            return None
+    
+    def _exec(self, pooled: PooledContainer, command: str, timeout: float) -> Tuple[int, str, str, float]:
+        """Run ``command`` under ``timeout`` and wait for it to exit.
+
+        The exec is started detached and polled with ``exec_inspect``: a batch
+        writes its results to files and keeps the attach socket silent, so
+        waiting on the socket would run into the Docker client's read timeout
+        long before the script's own deadline.
+        """
+        api = self.client.api
+        exec_id = api.exec_create(
+            pooled.id,
+            [
+                'sh', '-c',
+                f'mkdir -p {self.EXEC_DIR} && exec timeout -s KILL {timeout:.3f} sh -c "$0" '
+                f'> {self.EXEC_DIR}/stdout 2> {self.EXEC_DIR}/stderr',
+                command
+            ],
+            workdir='/workspace'
+        )['Id']
+        
+        start_time = time.time()
+        api.exec_start(exec_id, detach=True)
+        
+        deadline = start_time + timeout + self.KILL_GRACE
+        interval = self.EXEC_POLL_MIN
+        while True:
+            state = api.exec_inspect(exec_id)
+            if not state['Running'] and state['ExitCode'] is not None:
+                break
+            if time.time() > deadline:
+                raise RuntimeError(f"Exec in container {pooled.short_id} did not exit within {timeout:.1f}s")
+            time.sleep(interval)
+            interval = min(interval * 2, self.EXEC_POLL_MAX)
+        elapsed = time.time() - start_time
+        
+        outputs = self._get_dir(pooled, self.EXEC_DIR)
+        return (
+            state['ExitCode'],
+            outputs.get('stdout', b'').decode('utf-8', errors='replace'),
+            outputs.get('stderr', b'').decode('utf-8', errors='replace'),
+            elapsed
+        )
+    
+    def _remove_dir(self, path: Optional[str]):
+        if path and os.path.exists(path):
             try:
-                exit_code = container.wait(timeout=min(time_limit, 30))['StatusCode']
-                compilation_time = time.time() - start_time
-            except docker.errors.NotFound:
-                # Container was auto-removed
-                exit_code = 0
-                compilation_time = time.time() - start_time
+                shutil.rmtree(path)
+            except OSError:
+                pass
+    
+    def _run_compilation(
+        self, pool: ContainerPool, workspace: str, compile_cmd: str, artifact: str, timeout: float, memory_limit: int
+    ) -> ExecutionResult:
+        """Run compilation step."""
+        pooled = None
+        healthy = True
+        try:
+            pooled = pool.acquire(memory_limit)
+            if self.cpu_allocator is not None:
+                # Keep compilers off the cores reserved for timed runs.
+                pooled.container.update(cpuset_cpus=self.cpu_allocator.unreserved_cpuset())
+            self._put_files(pooled, '/workspace', self._read_files(workspace))
             
-            # Get compilation output
-            try:
-                logs = container.logs(stdout=True, stderr=True).decode('utf-8', errors='replace')
-                stdout = ""
-                stderr = logs
-            except:
-                stdout = ""
-                stderr = "Failed to retrieve compilation logs"
+            exit_code, stdout, stderr, compilation_time = self._exec(pooled, compile_cmd, timeout)
             
             if exit_code != 0:
                 return ExecutionResult(
@@ -180,156 +437,250 @@ class DockerExecutor:
                     execution_time=compilation_time,
                     stdout=stdout,
                     stderr=stderr,
-                    error_message="Compilation failed"
+                    container_id=pooled.short_id,
+                    error_message="Compilation failed" if compilation_time < timeout else f"Compilation exceeded {timeout}s"
                 )
             
+            binary = self._get_file(pooled, f'/workspace/{artifact}')
+            if binary is None:
+                raise RuntimeError("Compiler did not produce an executable")
+            
+            artifact_path = os.path.join(workspace, artifact)
+            with open(artifact_path, 'wb') as f:
+                f.write(binary)
+            os.chmod(artifact_path, 0o755)
+            
             return ExecutionResult(
                 status=ExecutionStatus.SUCCESS,
                 exit_code=0,
                 execution_time=compilation_time,
                 stdout=stdout,
-                stderr=stderr
+                stderr=stderr,
+                container_id=pooled.short_id
             )
-            
-        except docker.errors.ContainerError as e:
+        
+        except docker.errors.ImageNotFound:
             return ExecutionResult(
-                status=ExecutionStatus.COMPILATION_ERROR,
-                exit_code=e.exit_status,
+                status=ExecutionStatus.DOCKER_ERROR,
+                exit_code=-1,
                 execution_time=0.0,
-                stderr=str(e),
-                error_message="Compilation error"
+                error_message=f"Docker image not found: {pool.image}"
             )
         except Exception as e:
+            healthy = False
+            reset_on_connection_error(e)
             return ExecutionResult(
                 status=ExecutionStatus.INTERNAL_ERROR,
                 exit_code=-1,
                 execution_time=0.0,
                 error_message=f"Compilation setup error: {e}"
             )
+        finally:
+            if pooled:
+                pool.release(pooled, healthy=healthy)
     
-    def _run_execution(self, container_config: Dict[str, Any], run_cmd: str, time_limit: float, input_data: str) -> ExecutionResult:
-        """Run execution step."""
-        container = None
+    def _run_batch(
+        self,
+        pool: ContainerPool,
+        files: Dict[str, Dict[str, bytes]],
+        run_cmd: str,
+        input_paths: List[str],
+        time_limit: float,
+        memory_limit: int,
+        isolated: bool = False,
+        stop_on_failure: bool = False
+    ) -> List[ExecutionResult]:
+        """Run every input through the supervisor in as few execs as possible.
+
+        Outputs are redirected to files on the container's tmpfs, where the
+        supervisor caps each one at ``OUTPUT_LIMIT`` bytes. A script stops
+        early once the results no longer leave room for another test at the
+        cap; they are then collected and the remaining inputs run in a
+        follow-up exec on the same container.
+        """
+        count = len(input_paths)
+        results: List[Optional[ExecutionResult]] = [None] * count
+        pooled = None
+        healthy = True
+        retry: List[int] = []
         try:
-            # Create container for execution
-            container = self.client.containers.create(
-                command=['sh', '-c', f'{run_cmd} < input.txt'],
-                **{**container_config, 'detach': True, 'remove': False}  # Don't auto-remove for proper cleanup
+            # Results written to the /workspace tmpfs are charged to the same
+            # memory cgroup as the solution, so the cgroup gets room for a full
+            # tmpfs on top of the limit. The solution's own usage is checked
+            # against ``memory_limit`` when each report is read.
+            pooled = pool.acquire(memory_limit + self.config.CONTAINER_TMPFS_SIZE)
+            for destination, contents in files.items():
+                self._put_files(pooled, destination, contents)
+            
+            wall_limit = time_limit * self.config.WALL_TIME_LIMIT_FACTOR
+            output_limit = self.config.OUTPUT_LIMIT
+            budget_kb = (self.config.CONTAINER_TMPFS_SIZE * 1024 * 1024 - 3 * output_limit) // 1024
+            supervisor = (
+                f'{self.config.SUPERVISOR_PATH} --cpu-limit {time_limit:.3f} --wall-limit {wall_limit:.3f} '
+                f'--output-limit {output_limit} -- {run_cmd}'
             )
+            # The supervisor exits non-zero for every limit and runtime error.
+            on_failure = f' || exit {self.STOPPED_ON_FAILURE}' if stop_on_failure else ''
             
-            # Start container and measure execution time
-            start_time = time.time()
-            container.start()
+            # Each exec is kept within the wall budget, so a container and its
+            # CPU are never tied up by one script for longer than that.
+            per_exec = max(1, int(self.config.EXECUTION_WALL_BUDGET // (wall_limit + self.KILL_GRACE)))
             
-            # Wait for execution with timeout
-            try:
-                result = container.wait(timeout=time_limit + 5)  # Add buffer for container overhead
-                exit_code = result['StatusCode']
-                execution_time = time.time() - start_time
-            except Exception:
-                # Timeout or other error
-                execution_time = time.time() - start_time
-                exit_code = -1
-                
-                # Force stop container
+            pending = list(range(count))
+            while pending:
+                chunk = pending[:per_exec]
+                # Each test starts from an empty working directory and /tmp, so
+                # nothing a previous run left behind is visible to the next one.
+                script = (
+                    f'rm -rf {self.RESULTS_DIR}; mkdir -p {self.RESULTS_DIR}; '
+                    f'for entry in {" ".join(f"{i}:{input_paths[i]}" for i in chunk)}; do '
+                    f'i=${{entry%%:*}}; '
+                    f'rm -rf /workspace/run /tmp/* 2>/dev/null; mkdir /workspace/run && cd /workspace/run && '
+                    f'{supervisor} < ${{entry#*:}} > {self.RESULTS_DIR}/$i.out '
+                    f'2> {self.RESULTS_DIR}/$i.err 3> {self.RESULTS_DIR}/$i.json{on_failure}; '
+                    f'[ "$(du -sk {self.RESULTS_DIR} | cut -f1)" -gt {budget_kb} ] && exit {self.BUDGET_EXHAUSTED}; '
+                    f'done; exit 0'
+                )
+                # The supervisor enforces the limits of every test itself; the
+                # outer timeout only catches a supervisor that fails to terminate.
+                timeout = len(chunk) * (wall_limit + self.KILL_GRACE)
+                # The CPU is only held while tests run, not while files are
+                # copied or results collected.
+                lease = self.cpu_allocator.acquire(isolated=isolated) if self.cpu_allocator is not None else None
                 try:
-                    container.kill()
-                except:
-                    pass
+                    if lease is not None:
+                        pooled.container.update(cpuset_cpus=lease.cpuset)
+                    monitor = CgroupMonitor.for_container(self.config.CGROUP_ROOT, pooled.id, fresh=pooled.uses == 0)
+                    if monitor is not None:
+                        monitor.start()
+                    
+                    script_exit, _, script_stderr, elapsed = self._exec(pooled, script, timeout)
+                    
+                    usage = monitor.stop() if monitor is not None else None
+                finally:
+                    if self.cpu_allocator is not None:
+                        self.cpu_allocator.release(lease)
+                outputs = self._get_dir(pooled, self.RESULTS_DIR)
                 
-                if execution_time > time_limit:
-                    return ExecutionResult(
+                remaining = []
+                for index in chunk:
+                    report = self._parse_report(outputs.get(f'{index}.json'), pooled)
+                    if report is None:
+                        remaining.append(index)
+                        continue
+                    
+                    if len(chunk) == 1 and usage and usage.memory_peak is not None:
+                        charged_kb = self._tmpfs_kb(outputs.values())
+                        memory_used = max(usage.memory_peak // 1024 - charged_kb, report['max_rss_kb'])
+                    else:
+                        memory_used = report['max_rss_kb']
+                    # The cgroup only counts OOM kills for the whole exec; a test
+                    # SIGKILLed without hitting its wall limit is attributed to it.
+                    oom_killed = bool(
+                        usage and usage.oom_killed
+                        and report['signal'] == signal.SIGKILL and not report['wall_limit_exceeded']
+                    )
+                    results[index] = ExecutionResult.from_report(
+                        report,
+                        outputs.get(f'{index}.out', b'').decode('utf-8', errors='replace'),
+                        outputs.get(f'{index}.err', b'').decode('utf-8', errors='replace'),
+                        time_limit,
+                        pooled.short_id,
+                        memory_used=memory_used,
+                        oom_killed=oom_killed,
+                        memory_limit=memory_limit
+                    )
+                
+                later = pending[len(chunk):]
+                if remaining and script_exit == self.BUDGET_EXHAUSTED and len(remaining) < len(chunk):
+                    pending = remaining + later
+                    continue
+                
+                if script_exit == self.STOPPED_ON_FAILURE:
+                    for index in remaining + later:
+                        results[index] = ExecutionResult(
+                            status=ExecutionStatus.SKIPPED,
+                            exit_code=-1,
+                            execution_time=0.0,
+                            container_id=pooled.short_id,
+                            error_message="Skipped after an earlier test failed"
+                        )
+                    break
+                
+                if remaining and script_exit == self.EXEC_KILLED:
+                    # Tests run in order, so only the first one without a
+                    # report was running when the exec was killed.
+                    running, not_started = remaining[0], remaining[1:] + later
+                    results[running] = ExecutionResult(
                         status=ExecutionStatus.TIME_LIMIT_EXCEEDED,
-                        exit_code=exit_code,
-                        execution_time=execution_time,
+                        exit_code=-1,
+                        execution_time=elapsed,
+                        wall_time=elapsed,
+                        container_id=pooled.short_id,
                         error_message=f"Execution exceeded time limit of {time_limit}s"
                     )
-            
-            # Get container output
-            try:
-                logs = container.logs(stdout=True, stderr=True).decode('utf-8', errors='replace')
-                # Docker combines stdout and stderr, try to separate them
-                stdout = logs
-                stderr = ""
+                    if stop_on_failure:
+                        for index in not_started:
+                            results[index] = ExecutionResult(
+                                status=ExecutionStatus.SKIPPED,
+                                exit_code=-1,
+                                execution_time=0.0,
+                                container_id=pooled.short_id,
+                                error_message="Skipped after an earlier test failed"
+                            )
+                    else:
+                        # A supervisor that had to be killed may have left
+                        # processes behind, so the rest runs on a fresh container.
+                        healthy = False
+                        retry = not_started
+                    break
                 
-                # If there's an error, try to get stderr
-                if exit_code != 0:
-                    stderr = logs
-                    stdout = ""
-                    
-            except Exception as e:
-                stdout = ""
-                stderr = f"Failed to retrieve output: {e}"
-            
-            # Check for time limit exceeded
-            if execution_time > time_limit:
-                return ExecutionResult(
-                    status=ExecutionStatus.TIME_LIMIT_EXCEEDED,
-                    exit_code=exit_code,
-                    execution_time=execution_time,
-                    stdout=stdout,
-                    stderr=stderr,
-                    container_id=container.short_id,
-                    error_message=f"Execution exceeded time limit of {time_limit}s"
-                )
-            
-            # Check for runtime error
-            if exit_code != 0:
-                # Check for specific error types
-                if any(keyword in stderr.lower() for keyword in ['stack overflow', 'segmentation fault']):
-                    status = ExecutionStatus.RUNTIME_ERROR
-                    error_msg = "Stack overflow or segmentation fault detected"
-                else:
-                    status = ExecutionStatus.RUNTIME_ERROR
-                    error_msg = f"Runtime error (exit code: {exit_code})"
-                
-                return ExecutionResult(
-                    status=status,
-                    exit_code=exit_code,
-                    execution_time=execution_time,
-                    stdout=stdout,
-                    stderr=stderr,
-                    container_id=container.short_id,
-                    error_message=error_msg
-                )
-            
-            # Successful execution
-            return ExecutionResult(
-                status=ExecutionStatus.SUCCESS,
-                exit_code=exit_code,
-                execution_time=execution_time,
-                stdout=stdout,
-                stderr=stderr,
-                container_id=container.short_id
-            )
-            
-        except docker.errors.ContainerError as e:
-            return ExecutionResult(
-                status=ExecutionStatus.RUNTIME_ERROR,
-                exit_code=e.exit_status,
-                execution_time=time.time() - start_time if 'start_time' in locals() else 0.0,
-                stderr=str(e),
-                error_message="Container execution error"
-            )
+                for index in remaining:
+                    healthy = False
+                    results[index] = ExecutionResult(
+                        status=ExecutionStatus.INTERNAL_ERROR,
+                        exit_code=-1,
+                        execution_time=0.0,
+                        container_id=pooled.short_id,
+                        error_message=f"Timing supervisor produced no report: {script_stderr.strip() or 'no output'}"
+                    )
+                if not healthy:
+                    for index in later:
+                        results[index] = ExecutionResult(
+                            status=ExecutionStatus.INTERNAL_ERROR,
+                            exit_code=-1,
+                            execution_time=0.0,
+                            container_id=pooled.short_id,
+                            error_message="Not run after the timing supervisor failed"
+                        )
+                    break
+                pending = later
+        
         except docker.errors.ImageNotFound:
-            return ExecutionResult(
+            return [ExecutionResult(
                 status=ExecutionStatus.DOCKER_ERROR,
                 exit_code=-1,
                 execution_time=0.0,
-                error_message=f"Docker image not found: {container_config.get('image', 'unknown')}"
-            )
+                error_message=f"Docker image not found: {pool.image}"
+            ) for _ in range(count)]
         except Exception as e:
-            return ExecutionResult(
+            healthy = False
+            reset_on_connection_error(e)
+            return [ExecutionResult(
                 status=ExecutionStatus.INTERNAL_ERROR,
                 exit_code=-1,
                 execution_time=0.0,
                 error_message=f"Execution setup error: {e}"
-            )
+            ) for _ in range(count)]
         finally:
-            # Cleanup container
-            if container:
-                try:
-                    container.stop(timeout=1)
-                    container.remove()
-                except:
-                    pass
+            if pooled:
+                pool.release(pooled, healthy=healthy)
+        
+        if retry:
+            retried = self._run_batch(
+                pool, files, run_cmd, [input_paths[index] for index in retry], time_limit, memory_limit,
+                isolated, stop_on_failure
+            )
+            for index, result in zip(retry, retried):
+                results[index] = result
+        return results
@@ -1,16 +1,20 @@
+import signal
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
+from typing import Dict, Optional
 
 
 class ExecutionStatus(Enum):
     SUCCESS = "success"
     TIME_LIMIT_EXCEEDED = "time_limit_exceeded"
     MEMORY_LIMIT_EXCEEDED = "memory_limit_exceeded"
+    OUTPUT_LIMIT_EXCEEDED = "output_limit_exceeded"
     RUNTIME_ERROR = "runtime_error"
     COMPILATION_ERROR = "compilation_error"
     INTERNAL_ERROR = "internal_error"
     DOCKER_ERROR = "docker_error"
+    # Not run because an earlier input of the same batch failed.
+    SKIPPED = "skipped"
 
 
 @dataclass
@@ -20,6 +24,8 @@ class ExecutionResult:
     exit_code: int
     execution_time: float
     memory_used: Optional[int] = None
+    cpu_time: Optional[float] = None
+    wall_time: Optional[float] = None
     stdout: str = ""
     stderr: str = ""
     container_id: Optional[str] = None
@@ -35,9 +41,90 @@ class ExecutionResult:
             'exit_code': self.exit_code,
             'execution_time': self.execution_time,
             'memory_used': self.memory_used,
+            'cpu_time': self.cpu_time,
+            'wall_time': self.wall_time,
             'stdout': self.stdout,
             'stderr': self.stderr,
             'container_id': self.container_id,
             'error_message': self.error_message,
             'success': self.success
         }
+    
+    @classmethod
+    def from_report(
+        cls,
+        report: Dict,
+        stdout: str,
+        stderr: str,
+        time_limit: float,
+        container_id: str,
+        memory_used: Optional[int],
+        oom_killed: bool,
+        memory_limit: Optional[int] = None
+    ) -> 'ExecutionResult':
+        """Build a result from a timing supervisor report.
+
+        ``memory_limit`` (MB) is checked against ``memory_used`` (KB) where the
+        memory cgroup leaves the run more room than the problem allows.
+        """
+        exit_code = report['exit_code']
+        measurements = {
+            'exit_code': exit_code,
+            'execution_time': report['cpu_time'],
+            'cpu_time': report['cpu_time'],
+            'wall_time': report['wall_time'],
+            'memory_used': memory_used,
+            'stdout': stdout,
+            'stderr': stderr,
+            'container_id': container_id
+        }
+        
+        if oom_killed:
+            return cls(
+                status=ExecutionStatus.MEMORY_LIMIT_EXCEEDED,
+                error_message="Process killed after exceeding the memory limit",
+                **measurements
+            )
+        
+        if memory_limit is not None and memory_used is not None and memory_used > memory_limit * 1024:
+            return cls(
+                status=ExecutionStatus.MEMORY_LIMIT_EXCEEDED,
+                error_message=f"Memory usage exceeded the limit of {memory_limit}MB",
+                **measurements
+            )
+        
+        if report.get('output_limit_exceeded'):
+            return cls(
+                status=ExecutionStatus.OUTPUT_LIMIT_EXCEEDED,
+                error_message="Output exceeded the size limit",
+                **measurements
+            )
+        
+        # Check for time limit exceeded
+        if report['cpu_limit_exceeded'] or report['wall_limit_exceeded']:
+            return cls(
+                status=ExecutionStatus.TIME_LIMIT_EXCEEDED,
+                error_message=f"Execution exceeded time limit of {time_limit}s",
+                **measurements
+            )
+        
+        # Check for runtime error
+        if exit_code != 0:
+            # Check for specific error types
+            if report['signal'] == signal.SIGSEGV or any(
+                keyword in stderr.lower() for keyword in ['stack overflow', 'segmentation fault']
+            ):
+                error_msg = "Stack overflow or segmentation fault detected"
+            elif report['signal']:
+                error_msg = f"Runtime error (killed by {signal.Signals(report['signal']).name})"
+            else:
+                error_msg = f"Runtime error (exit code: {exit_code})"
+            
+            return cls(
+                status=ExecutionStatus.RUNTIME_ERROR,
+                error_message=error_msg,
+                **measurements
+            )
+        
+        # Successful execution
+        return cls(status=ExecutionStatus.SUCCESS, **measurements)
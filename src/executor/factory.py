@@ -0,0 +1,15 @@
+from config.app import AppConfig
+
+
+def create_executor(config: AppConfig = None):
+    config = config or AppConfig()
+    backend = config.EXECUTOR_BACKEND.lower()
+    
+    if backend == 'docker':
+        from .docker_executor import DockerExecutor
+        return DockerExecutor(config)
+    if backend == 'local':
+        from .local_executor import LocalExecutor
+        return LocalExecutor(config)
+    
+    raise ValueError(f"Unknown executor backend: {config.EXECUTOR_BACKEND}")
@@ -0,0 +1,599 @@
+import logging
+import math
+import os
+import resource
+import shlex
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple, Union
+
+from .execution_result import ExecutionResult, ExecutionStatus
+from .prepared_program import PreparedProgram
+from .compilation_cache import CompilationCache, get_compilation_cache
+from .cpu_allocator import CpuAllocator, get_cpu_allocator
+from .cgroup_stats import CgroupMonitor
+from .test_data_store import StoredInput, TestDataStore, get_answer_store, get_test_data_store
+from config.app import AppConfig
+
+
+logger = logging.getLogger(__name__)
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+
+# The child stops itself before exec'ing the solution, so the parent can move
+# it into its cgroup and set its limits without running code after fork.
+GATE = ['sh', '-c', 'kill -STOP $$; exec "$@"', 'sh']
+
+# Drops every capability, so a solution cannot unmount what hides the judge's files.
+DROP_PRIVILEGES = ['setpriv', '--bounding-set=-all', '--inh-caps=-all', '--no-new-privs', '--']
+
+_namespaces = None
+_namespace_lock = threading.Lock()
+
+
+def _probe_namespaces() -> Tuple[List[str], bool]:
+    global _namespaces
+    
+    with _namespace_lock:
+        if _namespaces is None:
+            command = ['unshare', '--net', '--mount'] + ([] if os.geteuid() == 0 else ['--user'])
+            hide = 'mount -t tmpfs -o size=4k tmpfs "$1" && shift && exec "$@"'
+            
+            def probe(*args) -> bool:
+                try:
+                    return subprocess.run(command + list(args), capture_output=True, timeout=5).returncode == 0
+                except (OSError, subprocess.SubprocessError):
+                    return False
+            
+            if not probe('true'):
+                logger.warning("Cannot create namespaces with unshare, solutions keep the host network")
+                _namespaces = ([], False)
+            elif not probe('sh', '-c', hide, 'sh', tempfile.gettempdir(), *DROP_PRIVILEGES, 'true'):
+                logger.warning("Cannot mount inside the namespace or drop privileges, solutions can read the judge's data")
+                _namespaces = (command, False)
+            else:
+                _namespaces = (command, True)
+        return _namespaces
+
+
+def get_namespace_prefix() -> List[str]:
+    """``unshare`` prefix for a private network and mount namespace, or [] where the kernel refuses one."""
+    return _probe_namespaces()[0]
+
+
+def can_hide_paths() -> bool:
+    """Whether the namespace can mount over the judge's directories and drop the capabilities that could undo it."""
+    return _probe_namespaces()[1]
+
+
+class LocalExecutor:
+    """Runs submissions as plain host processes instead of containers.
+
+    Meant for trusted workloads and experiment harnesses where container
+    startup dominates short tests. Solutions are confined with rlimits, a
+    private network and mount namespace where the kernel allows it, and a
+    per-run cgroup v2 group when ``LOCAL_CGROUP_ROOT`` is writable, whose
+    ``pids.max`` also caps the number of processes. Without the cgroup the
+    cap falls back to ``RLIMIT_NPROC``.
+    
+    Inside the mount namespace the judge's data directories are covered with
+    empty tmpfs mounts, and only the solution's own workspace stays visible
+    under ``WORKSPACE_DIR``. Checkers run without this, since they are given
+    the answer file.
+    """
+    
+    # Interval at which a running solution's CPU time is checked against the limit.
+    CPU_POLL_INTERVAL = 0.01
+    
+    LANGUAGES = {
+        'cpp': {
+            'source_file': 'solution.cpp',
+            'compile_cmd': 'g++ -O2 -o solution solution.cpp',
+            'artifact': 'solution',
+            'run_cmd': '{workspace}/solution',
+        },
+        'python': {
+            'source_file': 'solution.py',
+            'compile_cmd': None,
+            'artifact': None,
+            'run_cmd': 'python3 {workspace}/solution.py',
+        },
+    }
+    
+    def __init__(self, config: AppConfig = None):
+        self.config = config or AppConfig()
+        self.compilation_cache: Optional[CompilationCache] = get_compilation_cache(self.config)
+        self.cpu_allocator: Optional[CpuAllocator] = get_cpu_allocator(self.config)
+        self.test_data: TestDataStore = get_test_data_store(self.config)
+        self.answers: TestDataStore = get_answer_store(self.config)
+        self._compiler_version = None
+        
+        self.cgroup_root = self.config.LOCAL_CGROUP_ROOT or None
+        if self.cgroup_root and not os.access(self.cgroup_root, os.W_OK):
+            logger.warning(f"Cgroup root {self.cgroup_root} is not writable, falling back to rlimit accounting")
+            self.cgroup_root = None
+        if not self.cgroup_root and self.config.LOCAL_NPROC_LIMIT > 0:
+            logger.warning(
+                "No cgroup for local runs, so processes are only capped by RLIMIT_NPROC, which counts every "
+                "process of the user (per user namespace since Linux 5.14) and does not apply to root"
+            )
+        
+        self.hidden_dirs = self._hidden_dirs()
+    
+    def execute_cpp(
+        self, source_code: str, input_data: str, time_limit: float = None, memory_limit: int = None, isolated: bool = False
+    ) -> ExecutionResult:
+        return self._execute_code(self.prepare_cpp(source_code), input_data, time_limit, memory_limit, isolated)
+    
+    def execute_python(
+        self, source_code: str, input_data: str, time_limit: float = None, memory_limit: int = None, isolated: bool = False
+    ) -> ExecutionResult:
+        return self._execute_code(self.prepare_python(source_code), input_data, time_limit, memory_limit, isolated)
+    
+    def prepare_cpp(self, source_code: str) -> PreparedProgram:
+        return self._prepare_program(source_code, 'cpp')
+    
+    def prepare_python(self, source_code: str) -> PreparedProgram:
+        return self._prepare_program(source_code, 'python')
+    
+    def run_prepared(
+        self,
+        program: PreparedProgram,
+        input_data: Union[str, StoredInput],
+        time_limit: float = None,
+        memory_limit: int = None,
+        isolated: bool = False
+    ) -> ExecutionResult:
+        if not program.success:
+            return program.compilation
+        if time_limit is None:
+            time_limit = self.config.DEFAULT_TIME_LIMIT
+        if memory_limit is None:
+            memory_limit = self.config.DEFAULT_MEMORY_LIMIT
+        
+        lease = None
+        try:
+            if self.cpu_allocator is not None:
+                lease = self.cpu_allocator.acquire(isolated=isolated)
+            if isinstance(input_data, str):
+                input_data = self.test_data.put(input_data)
+            input_path = self.test_data.path_for(input_data)
+            return self._run_process(program, input_path, time_limit, memory_limit, lease.cpu if lease else None)
+        
+        except Exception as e:
+            logger.error(f"Execution error: {e}")
+            return ExecutionResult(
+                status=ExecutionStatus.INTERNAL_ERROR,
+                exit_code=-1,
+                execution_time=0.0,
+                error_message=str(e)
+            )
+        finally:
+            if self.cpu_allocator is not None:
+                self.cpu_allocator.release(lease)
+    
+    def execute_batch(
+        self,
+        program: PreparedProgram,
+        inputs: List[Union[str, StoredInput]],
+        time_limit: float = None,
+        memory_limit: int = None,
+        stop_on_failure: bool = False
+    ) -> List[ExecutionResult]:
+        # Without container startup to amortise, a batch is just a loop.
+        results = []
+        for input_data in inputs:
+            if stop_on_failure and results and not results[-1].success:
+                results.append(ExecutionResult(
+                    status=ExecutionStatus.SKIPPED,
+                    exit_code=-1,
+                    execution_time=0.0,
+                    error_message="Skipped after an earlier test failed"
+                ))
+                continue
+            results.append(self.run_prepared(program, input_data, time_limit, memory_limit))
+        return results
+    
+    def run_checker(
+        self,
+        checker: PreparedProgram,
+        input_data: StoredInput,
+        answer: StoredInput,
+        output: str,
+        time_limit: float = None,
+        memory_limit: int = None
+    ) -> ExecutionResult:
+        """Run a compiled custom checker as ``checker <input> <output> <answer>``."""
+        if not checker.success:
+            return checker.compilation
+        if time_limit is None:
+            time_limit = self.config.CHECKER_TIME_LIMIT
+        if memory_limit is None:
+            memory_limit = self.config.CHECKER_MEMORY_LIMIT
+        
+        check_dir = None
+        try:
+            check_dir = tempfile.mkdtemp(prefix='check-', dir=checker.workspace)
+            output_path = os.path.join(check_dir, 'output.txt')
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(output)
+            input_path = self.test_data.path_for(input_data)
+            args = [input_path, output_path, self.answers.path_for(answer)]
+            return self._run_process(checker, input_path, time_limit, memory_limit, None, args, hide_data=False)
+        
+        except Exception as e:
+            logger.error(f"Checker error: {e}")
+            return ExecutionResult(
+                status=ExecutionStatus.INTERNAL_ERROR,
+                exit_code=-1,
+                execution_time=0.0,
+                error_message=str(e)
+            )
+        finally:
+            if check_dir:
+                shutil.rmtree(check_dir, ignore_errors=True)
+    
+    def release(self, program: PreparedProgram):
+        if program is not None:
+            shutil.rmtree(program.workspace, ignore_errors=True)
+    
+    def _execute_code(
+        self,
+        program: PreparedProgram,
+        input_data: str,
+        time_limit: float,
+        memory_limit: int,
+        isolated: bool = False
+    ) -> ExecutionResult:
+        try:
+            return self.run_prepared(program, input_data, time_limit, memory_limit, isolated)
+        finally:
+            self.release(program)
+    
+    def _prepare_program(self, source_code: str, language: str) -> PreparedProgram:
+        if language not in self.LANGUAGES:
+            raise ValueError(f"Unsupported language: {language}")
+        spec = self.LANGUAGES[language]
+        
+        os.makedirs(self.config.WORKSPACE_DIR, exist_ok=True)
+        workspace = tempfile.mkdtemp(prefix=f'{language}-', dir=self.config.WORKSPACE_DIR)
+        program = PreparedProgram(
+            language=language,
+            image='local',
+            workspace=workspace,
+            run_cmd=spec['run_cmd'].format(workspace=workspace),
+            compilation=ExecutionResult(status=ExecutionStatus.SUCCESS, exit_code=0, execution_time=0.0)
+        )
+        
+        try:
+            with open(os.path.join(workspace, spec['source_file']), 'w', encoding='utf-8') as f:
+                f.write(source_code)
+            
+            if spec['compile_cmd']:
+                program.compilation, program.cached = self._compile(source_code, spec, workspace)
+        
+        except Exception as e:
+            logger.error(f"Preparation error: {e}")
+            program.compilation = ExecutionResult(
+                status=ExecutionStatus.INTERNAL_ERROR,
+                exit_code=-1,
+                execution_time=0.0,
+                error_message=str(e)
+            )
+        
+        return program
+    
+    def _compile(self, source_code: str, spec: Dict, workspace: str) -> Tuple[ExecutionResult, bool]:
+        artifact_path = os.path.join(workspace, spec['artifact'])
+        
+        cache_key = None
+        if self.compilation_cache is not None:
+            cache_key = CompilationCache.make_key(source_code, spec['compile_cmd'], self._compiler_identity())
+            cached = self.compilation_cache.get(cache_key, artifact_path)
+            if cached is not None:
+                return cached, True
+        
+        timeout = self.config.DOCKER_TIMEOUT
+        start_time = time.monotonic()
+        try:
+            completed = subprocess.run(
+                shlex.split(spec['compile_cmd']),
+                cwd=workspace,
+                capture_output=True,
+                timeout=timeout
+            )
+        except subprocess.TimeoutExpired as e:
+            return ExecutionResult(
+                status=ExecutionStatus.COMPILATION_ERROR,
+                exit_code=-1,
+                execution_time=time.monotonic() - start_time,
+                stderr=(e.stderr or b'').decode('utf-8', errors='replace'),
+                error_message=f"Compilation exceeded {timeout}s"
+            ), False
+        compilation_time = time.monotonic() - start_time
+        
+        stdout = completed.stdout.decode('utf-8', errors='replace')
+        stderr = completed.stderr.decode('utf-8', errors='replace')
+        
+        if completed.returncode != 0:
+            compilation = ExecutionResult(
+                status=ExecutionStatus.COMPILATION_ERROR,
+                exit_code=completed.returncode,
+                execution_time=compilation_time,
+                stdout=stdout,
+                stderr=stderr,
+                error_message="Compilation failed"
+            )
+            if cache_key is not None:
+                self.compilation_cache.put(cache_key, compilation)
+            return compilation, False
+        
+        compilation = ExecutionResult(
+            status=ExecutionStatus.SUCCESS,
+            exit_code=0,
+            execution_time=compilation_time,
+            stdout=stdout,
+            stderr=stderr
+        )
+        if cache_key is not None:
+            self.compilation_cache.put(cache_key, compilation, artifact_path)
+        return compilation, False
+    
+    def _compiler_identity(self) -> str:
+        if self._compiler_version is None:
+            completed = subprocess.run(['g++', '--version'], capture_output=True, text=True)
+            self._compiler_version = f"local:{completed.stdout.splitlines()[0] if completed.stdout else 'g++'}"
+        return self._compiler_version
+    
+    def _run_process(
+        self,
+        program: PreparedProgram,
+        input_path: str,
+        time_limit: float,
+        memory_limit: int,
+        cpu: Optional[int],
+        args: List[str] = (),
+        hide_data: bool = True
+    ) -> ExecutionResult:
+        run_dir = tempfile.mkdtemp(prefix='run-', dir=program.workspace)
+        cgroup_path = self._create_cgroup(memory_limit)
+        try:
+            wall_limit = time_limit * self.config.WALL_TIME_LIMIT_FACTOR
+            command = GATE + shlex.split(program.run_cmd) + list(args)
+            if self.config.LOCAL_ISOLATE_NAMESPACES:
+                if hide_data and can_hide_paths():
+                    command = self._hiding_gate(program.workspace, run_dir) + shlex.split(program.run_cmd) + list(args)
+                command = get_namespace_prefix() + command
+            
+            monitor = CgroupMonitor(cgroup_path, fresh=True) if cgroup_path else None
+            
+            with open(input_path, 'rb') as stdin, \
+                    open(os.path.join(run_dir, 'stdout'), 'wb') as stdout, \
+                    open(os.path.join(run_dir, 'stderr'), 'wb') as stderr:
+                # No preexec_fn: running Python in a child forked from the
+                # multi-threaded judge can deadlock.
+                process = subprocess.Popen(
+                    command,
+                    cwd=run_dir,
+                    stdin=stdin,
+                    stdout=stdout,
+                    stderr=stderr,
+                    start_new_session=True
+                )
+                
+                _, status, rusage = os.wait4(process.pid, os.WUNTRACED)
+                start_time = time.monotonic()
+                wall_expired = threading.Event()
+                cpu_expired = threading.Event()
+                if os.WIFSTOPPED(status):
+                    try:
+                        if monitor is not None:
+                            monitor.start()
+                        self._confine(process.pid, time_limit, memory_limit, cpu, cgroup_path)
+                    except BaseException:
+                        self._kill_group(process.pid)
+                        os.wait4(process.pid, 0)
+                        process.returncode = -signal.SIGKILL
+                        raise
+                    
+                    finished = threading.Event()
+                    
+                    def watchdog():
+                        # The limit is enforced here; RLIMIT_CPU is only a backstop.
+                        deadline = start_time + wall_limit
+                        while not finished.wait(min(self.CPU_POLL_INTERVAL, max(0.0, deadline - time.monotonic()))):
+                            if time.monotonic() >= deadline:
+                                wall_expired.set()
+                            elif self._cpu_time(process.pid, monitor) > time_limit:
+                                cpu_expired.set()
+                            else:
+                                continue
+                            self._kill_group(process.pid)
+                            return
+                    
+                    thread = threading.Thread(target=watchdog, daemon=True)
+                    start_time = time.monotonic()
+                    os.kill(process.pid, signal.SIGCONT)
+                    thread.start()
+                    try:
+                        _, status, rusage = os.wait4(process.pid, 0)
+                    finally:
+                        finished.set()
+                wall_time = time.monotonic() - start_time
+                process.returncode = os.waitstatus_to_exitcode(status)
+                # Nothing the solution started may outlive it.
+                self._kill_group(process.pid)
+            
+            usage = monitor.stop() if monitor is not None else None
+            
+            stdout_text = self._read_output(os.path.join(run_dir, 'stdout'))
+            stderr_text = self._read_output(os.path.join(run_dir, 'stderr'))
+            
+            cpu_time = rusage.ru_utime + rusage.ru_stime
+            term_signal = os.WTERMSIG(status) if os.WIFSIGNALED(status) else 0
+            report = {
+                'exit_code': os.WEXITSTATUS(status) if os.WIFEXITED(status) else 128 + term_signal,
+                'signal': term_signal,
+                'cpu_time': cpu_time,
+                'wall_time': wall_time,
+                'cpu_limit_exceeded': cpu_expired.is_set() or cpu_time > time_limit or term_signal == signal.SIGXCPU,
+                'wall_limit_exceeded': wall_expired.is_set(),
+                # Python ignores SIGXFSZ, so a file at the cap counts as well.
+                'output_limit_exceeded': term_signal == signal.SIGXFSZ or any(
+                    os.path.getsize(os.path.join(run_dir, name)) >= self.config.OUTPUT_LIMIT
+                    for name in ('stdout', 'stderr')
+                )
+            }
+            
+            # ru_maxrss is no use here: the child inherits the judge's high-water
+            # mark across fork and exec, so only the cgroup's peak is reported.
+            if usage is not None:
+                memory_used = usage.memory_peak // 1024 if usage.memory_peak is not None else None
+                oom_killed = usage.oom_killed
+            else:
+                # Under RLIMIT_AS an oversized allocation fails inside the
+                # program instead of triggering the OOM killer.
+                memory_used = None
+                oom_killed = report['exit_code'] != 0 and any(
+                    marker in stderr_text for marker in ('MemoryError', 'std::bad_alloc')
+                )
+            
+            return ExecutionResult.from_report(
+                report, stdout_text, stderr_text, time_limit, None,
+                memory_used=memory_used,
+                oom_killed=oom_killed,
+                memory_limit=memory_limit
+            )
+        finally:
+            shutil.rmtree(run_dir, ignore_errors=True)
+            self._remove_cgroup(cgroup_path)
+    
+    def _confine(self, pid: int, time_limit: float, memory_limit: int, cpu: Optional[int], cgroup_path: Optional[str]):
+        """Apply the run's limits to the stopped child ``pid``; they carry over into the solution's exec."""
+        output_bytes = self.config.OUTPUT_LIMIT
+        # Generous enough never to fire before the watchdog does.
+        cpu_seconds = math.ceil(time_limit * self.config.WALL_TIME_LIMIT_FACTOR) + 1
+        
+        if cpu is not None:
+            os.sched_setaffinity(pid, {cpu})
+        resource.prlimit(pid, resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+        resource.prlimit(pid, resource.RLIMIT_FSIZE, (output_bytes, output_bytes))
+        resource.prlimit(pid, resource.RLIMIT_CORE, (0, 0))
+        if cgroup_path:
+            with open(os.path.join(cgroup_path, 'cgroup.procs'), 'w') as f:
+                f.write(str(pid))
+        else:
+            # Address space is a coarse stand-in when memory.max is unavailable.
+            memory_bytes = memory_limit * 1024 * 1024
+            resource.prlimit(pid, resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+            nproc = self.config.LOCAL_NPROC_LIMIT
+            if nproc > 0:
+                resource.prlimit(pid, resource.RLIMIT_NPROC, (nproc, nproc))
+    
+    def _hidden_dirs(self) -> List[str]:
+        """The judge's own directories, outermost first, leaving out any that hold the workspaces."""
+        workspace_root = os.path.abspath(self.config.WORKSPACE_DIR)
+        candidates = [
+            self.config.TEST_DATA_DIR,
+            self.config.ANSWER_DATA_DIR,
+            self.config.PAYLOAD_DATA_DIR,
+            self.config.COMPILATION_CACHE_DIR,
+            self.config.REFERENCE_SOLUTIONS_DIR,
+            self.config.PROBLEMS_DATA_DIR,
+            self.config.TEMP_DIR,
+            os.path.dirname(self.config.LOG_FILE) if self.config.LOG_FILE else None,
+            os.path.dirname(os.getenv('SQLITE_PATH', 'data/adaptive_judge.db')),
+        ]
+        
+        def within(path: str, parent: str) -> bool:
+            return path == parent or path.startswith(parent.rstrip(os.sep) + os.sep)
+        
+        hidden = []
+        for path in sorted({os.path.abspath(c) for c in candidates if c}, key=len):
+            if within(workspace_root, path) or within(path, workspace_root):
+                continue
+            if any(within(path, outer) for outer in hidden):
+                continue
+            hidden.append(path)
+        return hidden
+    
+    def _hiding_gate(self, workspace: str, run_dir: str) -> List[str]:
+        """A ``GATE`` that also hides the judge's files and drops privileges before the exec.
+        
+        The shell starts in ``run_dir``, so after covering the workspace root
+        it can bind its own workspace back from ``..``; ``--no-canonicalize``
+        keeps mount from resolving that through the new tmpfs.
+        """
+        workspace_root = shlex.quote(os.path.dirname(workspace))
+        steps = [
+            'cd ..',
+            f'mount -t tmpfs -o size=4k,mode=0111 tmpfs {workspace_root}',
+            f'mkdir -p {shlex.quote(workspace)}',
+            f'mount --no-canonicalize --bind . {shlex.quote(workspace)}',
+            f'cd {shlex.quote(run_dir)}',
+        ]
+        steps += [
+            f'mount -t tmpfs -o size=4k,mode=0 tmpfs {shlex.quote(path)}'
+            for path in self.hidden_dirs if os.path.isdir(path)
+        ]
+        script = ' && '.join(steps) + ' || exit 126; kill -STOP $$; exec ' + ' '.join(DROP_PRIVILEGES) + ' "$@"'
+        return ['sh', '-c', script, 'sh']
+    
+    @staticmethod
+    def _cpu_time(pid: int, monitor: Optional[CgroupMonitor]) -> float:
+        if monitor is not None:
+            return monitor.cpu_time()
+        try:
+            with open(f'/proc/{pid}/stat', 'rb') as f:
+                fields = f.read().rsplit(b')', 1)[1].split()
+        except OSError:
+            return 0.0
+        # utime, stime, cutime and cstime, in clock ticks.
+        return sum(int(value) for value in fields[11:15]) / CLOCK_TICKS
+    
+    def _create_cgroup(self, memory_limit: int) -> Optional[str]:
+        if not self.cgroup_root:
+            return None
+        
+        path = os.path.join(self.cgroup_root, f'run-{uuid.uuid4().hex[:12]}')
+        try:
+            os.mkdir(path)
+            with open(os.path.join(path, 'memory.max'), 'w') as f:
+                f.write(str(memory_limit * 1024 * 1024))
+            with open(os.path.join(path, 'memory.swap.max'), 'w') as f:
+                f.write('0')
+            if self.config.LOCAL_NPROC_LIMIT > 0:
+                try:
+                    with open(os.path.join(path, 'pids.max'), 'w') as f:
+                        f.write(str(self.config.LOCAL_NPROC_LIMIT))
+                except OSError as e:
+                    logger.debug(f"No pids controller under {self.cgroup_root}: {e}")
+            return path
+        except OSError as e:
+            logger.warning(f"Cannot create cgroup under {self.cgroup_root}: {e}")
+            self._remove_cgroup(path)
+            return None
+    
+    def _remove_cgroup(self, path: Optional[str]):
+        if path and os.path.isdir(path):
+            try:
+                os.rmdir(path)
+            except OSError as e:
+                logger.warning(f"Cannot remove cgroup {path}: {e}")
+    
+    @staticmethod
+    def _kill_group(pid: int):
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+    
+    @staticmethod
+    def _read_output(path: str) -> str:
+        with open(path, 'rb') as f:
+            return f.read().decode('utf-8', errors='replace')
@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+
+from .execution_result import ExecutionResult
+
+
+@dataclass
+class PreparedProgram:
+    
+    language: str
+    image: str
+    workspace: str
+    run_cmd: str
+    compilation: ExecutionResult
+    cached: bool = False
+    
+    @property
+    def success(self) -> bool:
+        return self.compilation.success
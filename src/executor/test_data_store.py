@@ -0,0 +1,115 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Dict, Hashable, Optional
+
+
+# Where the store is mounted inside judge containers.
+CONTAINER_MOUNT = '/testdata'
+
+
+@dataclass(frozen=True)
+class StoredInput:
+    
+    key: str
+    size: int
+    
+    @property
+    def relative_path(self) -> str:
+        return os.path.join(self.key[:2], self.key)
+
+
+class TestDataStore:
+    """Content-addressed, write-once store of test inputs on the host.
+
+    Each input is written once under its sha256 and then only read: the
+    Docker backend bind-mounts the store read-only into every container and
+    solutions take stdin straight from it, so hot problems are served from
+    the page cache instead of being copied for every run.
+    """
+    
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self._versions: Dict[Hashable, StoredInput] = {}
+        self._lock = threading.Lock()
+        
+        os.makedirs(self.root, exist_ok=True)
+    
+    def put(self, data: str, version: Optional[Hashable] = None) -> StoredInput:
+        """Store ``data`` unless present; ``version`` skips rehashing known inputs."""
+        if version is not None:
+            with self._lock:
+                stored = self._versions.get(version)
+            if stored is not None:
+                return stored
+        
+        encoded = data.encode('utf-8')
+        stored = StoredInput(key=hashlib.sha256(encoded).hexdigest(), size=len(encoded))
+        path = self.path_for(stored)
+        
+        if not os.path.exists(path):
+            self._write(path, lambda f: f.write(encoded))
+        
+        if version is not None:
+            with self._lock:
+                self._versions[version] = stored
+        return stored
+    
+    def put_from(self, key: str, size: int, open_source: Callable[[], BinaryIO]) -> StoredInput:
+        """Store the payload with sha256 ``key``, streaming it from ``open_source`` if missing.
+        
+        The source is only opened the first time a payload is stored, so
+        staging an already known test case reads nothing.
+        """
+        stored = StoredInput(key=key, size=size)
+        path = self.path_for(stored)
+        
+        if not os.path.exists(path):
+            def copy(f):
+                with open_source() as source:
+                    shutil.copyfileobj(source, f, 1024 * 1024)
+            self._write(path, copy)
+        return stored
+    
+    def path_for(self, stored: StoredInput) -> str:
+        return os.path.join(self.root, stored.relative_path)
+    
+    def _write(self, path: str, write: Callable[[BinaryIO], None]):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, staging = tempfile.mkstemp(prefix='.staging-', dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.chmod(staging, 0o444)
+            os.replace(staging, path)
+        except BaseException:
+            if os.path.exists(staging):
+                os.unlink(staging)
+            raise
+
+
+_store = None
+_answer_store = None
+_store_lock = threading.Lock()
+
+
+def get_test_data_store(config) -> TestDataStore:
+    global _store
+    
+    with _store_lock:
+        if _store is None:
+            _store = TestDataStore(config.TEST_DATA_DIR)
+        return _store
+
+
+def get_answer_store(config) -> TestDataStore:
+    """Store of expected outputs, kept apart from the store mounted into containers."""
+    global _answer_store
+    
+    with _store_lock:
+        if _answer_store is None:
+            _answer_store = TestDataStore(config.ANSWER_DATA_DIR)
+        return _answer_store
@@ -1,13 +1,19 @@
 #!/usr/bin/env python3
 
+import atexit
 import os
 import logging
 from flask import Flask
 from dotenv import load_dotenv
 
 from config.app import get_config
+from config.database import DatabaseConfig
 from models import db
+from models.migrations import upgrade_schema
 from api import problems_bp, submissions_bp, benchmarks_bp, health_bp
+from services.judge_queue import JudgeQueue
+from services.result_writer import ResultWriter
+from services.registry import ServiceRegistry
 
 
 def create_app(config_name=None):
@@ -30,9 +36,37 @@ def create_app(config_name=None):
     app.register_blueprint(benchmarks_bp)
     
     with app.app_context():
+        DatabaseConfig.configure_engine(db.engine)
         db.create_all()
+        upgrade_schema(db.engine)
         app.logger.info("Database tables created/verified")
     
+    result_writer = None
+    if config_class.RESULT_WRITER_ENABLED:
+        result_writer = ResultWriter(
+            app,
+            batch_size=config_class.RESULT_WRITER_BATCH_SIZE,
+            max_delay=config_class.RESULT_WRITER_MAX_DELAY
+        )
+        app.extensions['result_writer'] = result_writer
+        result_writer.start()
+        atexit.register(result_writer.stop)
+    
+    services = ServiceRegistry(config_class(), result_writer=result_writer)
+    app.extensions['services'] = services
+    
+    judge_queue = JudgeQueue(
+        app,
+        workers=config_class.JUDGE_WORKERS,
+        service_factory=lambda: services.submissions
+    )
+    app.extensions['judge_queue'] = judge_queue
+    judge_queue.start()
+    # Registered after the result writer, so it stops first and its last
+    # verdicts are still written.
+    atexit.register(judge_queue.stop)
+    judge_queue.recover_pending()
+    
     @app.route('/')
     def index():
         return {
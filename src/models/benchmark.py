@@ -13,6 +13,9 @@ class BenchmarkStatus(Enum):
 class Benchmark(db.Model, TimestampMixin):
     
     __tablename__ = 'benchmarks'
+    __table_args__ = (
+        db.Index('ix_benchmarks_problem_id_created_at', 'problem_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     problem_id = db.Column(db.Integer, db.ForeignKey('problems.id'), nullable=False)
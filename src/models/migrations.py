@@ -0,0 +1,103 @@
+import logging
+from typing import List
+
+from sqlalchemy import inspect, literal, text
+
+from config.app import AppConfig
+from .base import db
+from .payload_store import PayloadStore, get_payload_store
+
+
+logger = logging.getLogger(__name__)
+
+# Test case columns whose contents now live in the payload store.
+LEGACY_PAYLOAD_COLUMNS = ('input_data', 'expected_output')
+
+
+def upgrade_schema(engine) -> List[str]:
+    """Add columns and indexes that exist on the models but not yet in the database.
+
+    ``db.create_all()`` only creates missing tables, so databases created by
+    an earlier version keep their old columns. Each missing column is added
+    with ``ALTER TABLE ... ADD COLUMN``, which SQLite and PostgreSQL both
+    support, using the model's scalar default where there is one. Missing
+    indexes are then created with ``CREATE INDEX``. Returns the added
+    columns as ``table.column`` and indexes by name.
+
+    Test case payloads stored inline by earlier versions are then moved to
+    the payload store and their columns dropped.
+    """
+    inspector = inspect(engine)
+    added = []
+    legacy_payloads = inspector.has_table('test_cases') and all(
+        column in {c['name'] for c in inspector.get_columns('test_cases')} for column in LEGACY_PAYLOAD_COLUMNS
+    )
+    
+    with engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                
+                ddl = f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(dialect=engine.dialect)}'
+                default = column.default.arg if column.default is not None and column.default.is_scalar else None
+                if default is not None:
+                    rendered = literal(default, type_=column.type).compile(
+                        dialect=engine.dialect, compile_kwargs={'literal_binds': True}
+                    )
+                    ddl += f' DEFAULT {rendered}'
+                    if not column.nullable:
+                        ddl += ' NOT NULL'
+                
+                connection.exec_driver_sql(ddl)
+                added.append(f'{table.name}.{column.name}')
+                logger.info(f"Added column {table.name}.{column.name}")
+            
+            existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name in existing_indexes:
+                    continue
+                
+                index.create(connection)
+                added.append(index.name)
+                logger.info(f"Added index {index.name} on {table.name}")
+        
+        if legacy_payloads:
+            moved = _move_test_case_payloads(connection, get_payload_store(AppConfig))
+            logger.info(f"Moved payloads of {moved} test cases to the payload store")
+    
+    return added
+
+
+def _move_test_case_payloads(connection, store: PayloadStore) -> int:
+    # Rows are read one at a time so large payloads are never all in memory.
+    ids = [row[0] for row in connection.exec_driver_sql('SELECT id FROM test_cases')]
+    
+    for test_case_id in ids:
+        input_data, expected_output = connection.execute(
+            text('SELECT input_data, expected_output FROM test_cases WHERE id = :id'), {'id': test_case_id}
+        ).one()
+        input_hash, input_bytes = store.put((input_data or '').encode('utf-8'))
+        output_hash, output_bytes = store.put((expected_output or '').encode('utf-8'))
+        connection.execute(
+            text(
+                'UPDATE test_cases SET input_hash = :input_hash, input_bytes = :input_bytes, '
+                'expected_output_hash = :output_hash, expected_output_bytes = :output_bytes WHERE id = :id'
+            ),
+            {
+                'id': test_case_id,
+                'input_hash': input_hash,
+                'input_bytes': input_bytes,
+                'output_hash': output_hash,
+                'output_bytes': output_bytes
+            }
+        )
+    
+    # Both SQLite (3.35+) and PostgreSQL support DROP COLUMN.
+    for column in LEGACY_PAYLOAD_COLUMNS:
+        connection.exec_driver_sql(f'ALTER TABLE test_cases DROP COLUMN {column}')
+    return len(ids)
@@ -0,0 +1,90 @@
+import hashlib
+import os
+import tempfile
+import threading
+from typing import BinaryIO, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    # Payloads are stored uncompressed until zstandard is installed; both
+    # forms are read back transparently.
+    zstandard = None
+
+
+COMPRESSED_SUFFIX = '.zst'
+COMPRESSION_LEVEL = 3
+
+
+class PayloadStore:
+    """Content-addressed, write-once store of test case inputs and outputs.
+
+    Payloads are kept out of the database: each one is written once under the
+    sha256 of its bytes, zstd-compressed, and the row only records the hash
+    and size. Reads return a stream, so a payload is loaded only when a test
+    case is actually judged or displayed.
+    """
+    
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        
+        os.makedirs(self.root, exist_ok=True)
+    
+    def put(self, data: bytes) -> Tuple[str, int]:
+        """Store ``data`` unless present and return its key and size."""
+        key = hashlib.sha256(data).hexdigest()
+        size = len(data)
+        if self.exists(key):
+            return key, size
+        
+        path = self._path(key)
+        if zstandard is not None:
+            data = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL).compress(data)
+            path += COMPRESSED_SUFFIX
+        
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, staging = tempfile.mkstemp(prefix='.staging-', dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.chmod(staging, 0o444)
+            os.replace(staging, path)
+        except OSError:
+            if os.path.exists(staging):
+                os.unlink(staging)
+            raise
+        
+        return key, size
+    
+    def exists(self, key: str) -> bool:
+        path = self._path(key)
+        return os.path.exists(path + COMPRESSED_SUFFIX) or os.path.exists(path)
+    
+    def open(self, key: str) -> BinaryIO:
+        """Open the uncompressed payload for streaming reads."""
+        path = self._path(key)
+        if os.path.exists(path + COMPRESSED_SUFFIX):
+            if zstandard is None:
+                raise RuntimeError(f"Payload {key} is zstd-compressed but zstandard is not installed")
+            return zstandard.ZstdDecompressor().stream_reader(open(path + COMPRESSED_SUFFIX, 'rb'), closefd=True)
+        return open(path, 'rb')
+    
+    def read(self, key: str) -> bytes:
+        with self.open(key) as f:
+            return f.read()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_payload_store(config) -> PayloadStore:
+    global _store
+    
+    with _store_lock:
+        if _store is None:
+            _store = PayloadStore(config.PAYLOAD_DATA_DIR)
+        return _store
@@ -1,4 +1,17 @@
 from .base import db, TimestampMixin
+from enum import Enum
+
+
+class CheckerType(Enum):
+    EXACT = "exact"
+    TOKEN = "token"
+    FLOAT = "float"
+    CUSTOM = "custom"
+
+
+class VerdictPolicy(Enum):
+    FULL_SCORING = "full_scoring"
+    FIRST_FAILURE = "first_failure"
 
 
 class Problem(db.Model, TimestampMixin):
@@ -14,6 +27,17 @@ class Problem(db.Model, TimestampMixin):
     difficulty = db.Column(db.String(50), nullable=False, default='medium')
     tags = db.Column(db.String(500))
     is_active = db.Column(db.Boolean, nullable=False, default=True)
+    # Stored as plain strings so the column can be added in place by
+    # models.migrations on databases created before checkers existed.
+    checker_type = db.Column(db.Enum(CheckerType, native_enum=False), nullable=False, default=CheckerType.EXACT)
+    checker_abs_epsilon = db.Column(db.Float)
+    checker_rel_epsilon = db.Column(db.Float)
+    checker_source = db.Column(db.Text)
+    verdict_policy = db.Column(
+        db.Enum(VerdictPolicy, native_enum=False), nullable=False, default=VerdictPolicy.FULL_SCORING
+    )
+    # Bumped whenever tests or judging settings change; part of the verdict cache key.
+    test_set_version = db.Column(db.Integer, nullable=False, default=1)
     test_cases = db.relationship('TestCase', backref='problem', lazy=True, cascade='all, delete-orphan')
     benchmarks = db.relationship('Benchmark', backref='problem', lazy=True, cascade='all, delete-orphan')
     submissions = db.relationship('Submission', backref='problem', lazy=True, cascade='all, delete-orphan')
@@ -33,6 +57,12 @@ class Problem(db.Model, TimestampMixin):
             'difficulty': self.difficulty,
             'tags': self.tags.split(',') if self.tags else [],
             'is_active': self.is_active,
+            'checker_type': self.checker_type.value if self.checker_type else CheckerType.EXACT.value,
+            'checker_abs_epsilon': self.checker_abs_epsilon,
+            'checker_rel_epsilon': self.checker_rel_epsilon,
+            'has_custom_checker': bool(self.checker_source),
+            'verdict_policy': (self.verdict_policy or VerdictPolicy.FULL_SCORING).value,
+            'test_set_version': self.test_set_version,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
         }
@@ -1,5 +1,7 @@
 from .base import db, TimestampMixin
+from .problem import VerdictPolicy
 from enum import Enum
+from typing import Dict, List, Optional
 
 
 class SubmissionStatus(Enum):
@@ -16,6 +18,7 @@ class SubmissionResult(Enum):
     RUNTIME_ERROR = "runtime_error"
     COMPILATION_ERROR = "compilation_error"
     MEMORY_LIMIT_EXCEEDED = "memory_limit_exceeded"
+    OUTPUT_LIMIT_EXCEEDED = "output_limit_exceeded"
     STACK_OVERFLOW = "stack_overflow"
     PRESENTATION_ERROR = "presentation_error"
     INTERNAL_ERROR = "internal_error"
@@ -29,13 +32,19 @@ class Language(Enum):
 class Submission(db.Model, TimestampMixin):
     
     __tablename__ = 'submissions'
+    __table_args__ = (
+        db.Index('ix_submissions_problem_id_created_at', 'problem_id', 'created_at'),
+        db.Index('ix_submissions_problem_id_user_id', 'problem_id', 'user_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     problem_id = db.Column(db.Integer, db.ForeignKey('problems.id'), nullable=False)
     
     user_id = db.Column(db.String(100), nullable=True)
     language = db.Column(db.Enum(Language), nullable=False)
-    source_code = db.Column(db.Text, nullable=False)
+    # Deferred: listings never need the source, only judging and include_code.
+    source_code = db.deferred(db.Column(db.Text, nullable=False))
+    source_hash = db.Column(db.String(64), nullable=True, index=True)
     
     status = db.Column(db.Enum(SubmissionStatus), nullable=False, default=SubmissionStatus.PENDING)
     result = db.Column(db.Enum(SubmissionResult), nullable=True)
@@ -48,6 +57,11 @@ class Submission(db.Model, TimestampMixin):
     
     benchmark_id = db.Column(db.Integer, db.ForeignKey('benchmarks.id'), nullable=True)
     time_limit_used = db.Column(db.Float, nullable=True)
+    # Overrides the problem's policy for this submission when set.
+    verdict_policy = db.Column(db.Enum(VerdictPolicy, native_enum=False), nullable=True)
+    test_set_version = db.Column(db.Integer, nullable=True)
+    # Set when the verdict was copied from an identical earlier submission.
+    cached_from_id = db.Column(db.Integer, db.ForeignKey('submissions.id'), nullable=True)
     
     compilation_error = db.Column(db.Text, nullable=True)
     runtime_error = db.Column(db.Text, nullable=True)
@@ -75,6 +89,9 @@ class Submission(db.Model, TimestampMixin):
             'total_test_cases': self.total_test_cases,
             'benchmark_id': self.benchmark_id,
             'time_limit_used': self.time_limit_used,
+            'verdict_policy': self.effective_verdict_policy.value,
+            'test_set_version': self.test_set_version,
+            'cached_from_id': self.cached_from_id,
             'compilation_error': self.compilation_error,
             'runtime_error': self.runtime_error,
             'docker_image': self.docker_image,
@@ -87,22 +104,43 @@ class Submission(db.Model, TimestampMixin):
             
         return result
     
-    def calculate_score(self):
+    @property
+    def effective_verdict_policy(self) -> VerdictPolicy:
+        if self.verdict_policy is not None:
+            return self.verdict_policy
+        if self.problem is not None and self.problem.verdict_policy is not None:
+            return self.problem.verdict_policy
+        return VerdictPolicy.FULL_SCORING
+    
+    def calculate_score(self, results: Optional[List] = None, weights: Optional[Dict[int, float]] = None):
+        """Weighted share of passed tests.
+        
+        ``weights`` maps test case ids to weights. Passing it, together with
+        results that are not yet flushed, avoids loading every test case.
+        """
+        if results is None:
+            results = self.test_results
+        
         if self.total_test_cases == 0:
             return 0.0
         
-        if not self.test_results:
+        if not results:
             return 0.0
         
-        total_weight = sum(tr.test_case.weight for tr in self.test_results)
-        passed_weight = sum(tr.test_case.weight for tr in self.test_results if tr.passed)
+        if weights is None:
+            weights = {tr.test_case_id: tr.test_case.weight for tr in results}
+        
+        total_weight = sum(weights[tr.test_case_id] for tr in results)
+        passed_weight = sum(weights[tr.test_case_id] for tr in results if tr.passed)
         
         if total_weight == 0:
             return 0.0
         
         return passed_weight / total_weight
     
-    def update_score(self):
-        self.score = self.calculate_score()
-        self.passed_test_cases = sum(1 for tr in self.test_results if tr.passed)
-        self.total_test_cases = len(self.test_results)
+    def update_score(self, results: Optional[List] = None, weights: Optional[Dict[int, float]] = None):
+        if results is None:
+            results = self.test_results
+        self.passed_test_cases = sum(1 for tr in results if tr.passed)
+        self.total_test_cases = len(results)
+        self.score = self.calculate_score(results, weights)
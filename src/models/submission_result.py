@@ -8,14 +8,19 @@ class ErrorType(Enum):
     TIME_LIMIT_EXCEEDED = "time_limit_exceeded"
     RUNTIME_ERROR = "runtime_error"
     MEMORY_LIMIT_EXCEEDED = "memory_limit_exceeded"
+    OUTPUT_LIMIT_EXCEEDED = "output_limit_exceeded"
     STACK_OVERFLOW = "stack_overflow"
     PRESENTATION_ERROR = "presentation_error"
     INTERNAL_ERROR = "internal_error"
+    SKIPPED = "skipped"
 
 
 class SubmissionTestResult(db.Model, TimestampMixin):
     
     __tablename__ = 'submission_results'
+    __table_args__ = (
+        db.Index('ix_submission_results_submission_id', 'submission_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     submission_id = db.Column(db.Integer, db.ForeignKey('submissions.id'), nullable=False)
@@ -25,16 +30,18 @@ class SubmissionTestResult(db.Model, TimestampMixin):
     execution_time = db.Column(db.Float, nullable=True)
     memory_used = db.Column(db.Integer, nullable=True)
     
-    actual_output = db.Column(db.Text, nullable=True)
-    output_diff = db.Column(db.Text, nullable=True)
+    # Output columns are deferred as one group and loaded together, either
+    # with undefer_group('output') or on first access.
+    actual_output = db.deferred(db.Column(db.Text, nullable=True), group='output')
+    output_diff = db.deferred(db.Column(db.Text, nullable=True), group='output')
     
     error_type = db.Column(db.Enum(ErrorType), nullable=False, default=ErrorType.NONE)
     error_message = db.Column(db.Text, nullable=True)
     exit_code = db.Column(db.Integer, nullable=True)
     
     container_id = db.Column(db.String(100), nullable=True)
-    stdout = db.Column(db.Text, nullable=True)
-    stderr = db.Column(db.Text, nullable=True)
+    stdout = db.deferred(db.Column(db.Text, nullable=True), group='output')
+    stderr = db.deferred(db.Column(db.Text, nullable=True), group='output')
     
     def __repr__(self):
         return f'<SubmissionTestResult {self.id}: Submission {self.submission_id}, TestCase {self.test_case_id} ({"PASS" if self.passed else "FAIL"})>'
@@ -1,15 +1,25 @@
+from typing import BinaryIO
+
+from config.app import AppConfig
 from .base import db, TimestampMixin
+from .payload_store import get_payload_store
 
 
 class TestCase(db.Model, TimestampMixin):
     
     __tablename__ = 'test_cases'
+    __table_args__ = (
+        db.Index('ix_test_cases_problem_id_created_at', 'problem_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     problem_id = db.Column(db.Integer, db.ForeignKey('problems.id'), nullable=False)
     name = db.Column(db.String(100), nullable=False)
-    input_data = db.Column(db.Text, nullable=False)
-    expected_output = db.Column(db.Text, nullable=False)
+    # Payloads live in the payload store; rows only hold their hash and size.
+    input_hash = db.Column(db.String(64), nullable=False)
+    input_bytes = db.Column(db.Integer, nullable=False)
+    expected_output_hash = db.Column(db.String(64), nullable=False)
+    expected_output_bytes = db.Column(db.Integer, nullable=False)
     complexity_hint = db.Column(db.String(50))
     input_size = db.Column(db.Integer)
     is_sample = db.Column(db.Boolean, nullable=False, default=False)
@@ -20,6 +30,30 @@ class TestCase(db.Model, TimestampMixin):
     def __repr__(self):
         return f'<TestCase {self.id}: {self.name} (Problem {self.problem_id})>'
     
+    @property
+    def input_data(self) -> str:
+        return get_payload_store(AppConfig).read(self.input_hash).decode('utf-8')
+    
+    @input_data.setter
+    def input_data(self, value: str):
+        self.input_hash, self.input_bytes = get_payload_store(AppConfig).put(value.encode('utf-8'))
+    
+    @property
+    def expected_output(self) -> str:
+        return get_payload_store(AppConfig).read(self.expected_output_hash).decode('utf-8')
+    
+    @expected_output.setter
+    def expected_output(self, value: str):
+        self.expected_output_hash, self.expected_output_bytes = get_payload_store(AppConfig).put(
+            value.encode('utf-8')
+        )
+    
+    def open_input(self) -> BinaryIO:
+        return get_payload_store(AppConfig).open(self.input_hash)
+    
+    def open_expected_output(self) -> BinaryIO:
+        return get_payload_store(AppConfig).open(self.expected_output_hash)
+    
     def to_dict(self, include_data=False):
         result = {
             'id': self.id,
@@ -27,6 +61,8 @@ class TestCase(db.Model, TimestampMixin):
             'name': self.name,
             'complexity_hint': self.complexity_hint,
             'input_size': self.input_size,
+            'input_bytes': self.input_bytes,
+            'expected_output_bytes': self.expected_output_bytes,
             'is_sample': self.is_sample,
             'is_hidden': self.is_hidden,
             'weight': self.weight,
@@ -3,9 +3,11 @@ import logging
 import statistics
 from typing import List, Tuple, Optional, Dict, Any
 
+from sqlalchemy import func
+
 from models import db, Problem, TestCase, Benchmark, ProblemBenchmarkActive
 from models.benchmark import BenchmarkStatus
-from executor import DockerExecutor, ExecutionStatus
+from executor import ExecutionStatus, create_executor
 from config.app import AppConfig
 
 
@@ -14,9 +16,9 @@ logger = logging.getLogger(__name__)
 
 class BenchmarkService:
     
-    def __init__(self, config: AppConfig = None):
+    def __init__(self, config: AppConfig = None, executor=None):
         self.config = config or AppConfig()
-        self.executor = DockerExecutor(config)
+        self.executor = executor or create_executor(self.config)
     
     def create_benchmark(self, problem_id: int, repetitions: int = None, activated_by: str = None) -> Benchmark:
         if repetitions is None:
@@ -65,16 +67,15 @@ class BenchmarkService:
         return benchmark
     
     def _find_largest_test_case(self, problem_id: int) -> Optional[TestCase]:
-        test_cases = TestCase.query.filter_by(problem_id=problem_id).all()
+        largest = TestCase.query.filter_by(problem_id=problem_id).order_by(
+            func.coalesce(TestCase.input_size, TestCase.input_bytes).desc(),
+            TestCase.input_bytes.desc(),
+            TestCase.id.asc()
+        ).first()
         
-        if not test_cases:
+        if not largest:
             return None
         
-        largest = max(test_cases, key=lambda tc: (
-            tc.input_size or len(tc.input_data),
-            len(tc.input_data)
-        ))
-        
         logger.info(f"Selected largest test case {largest.id} ({largest.name}) for benchmarking")
         return largest
     
@@ -164,12 +165,12 @@ class BenchmarkService:
                 if language == 'cpp':
                     result = self.executor.execute_cpp(
                         solution_code, test_case.input_data,
-                        time_limit=60.0
+                        time_limit=60.0, isolated=True
                     )
                 elif language == 'python':
                     result = self.executor.execute_python(
                         solution_code, test_case.input_data,
-                        time_limit=60.0
+                        time_limit=60.0, isolated=True
                     )
                 else:
                     raise ValueError(f"Unsupported language: {language}")
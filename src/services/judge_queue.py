@@ -0,0 +1,136 @@
+import logging
+import queue
+import threading
+from typing import Callable, Dict, List, Optional
+
+from flask import Flask, current_app
+
+from models import db, Submission
+from models.submission import SubmissionStatus, SubmissionResult
+
+
+logger = logging.getLogger(__name__)
+
+
+class JudgeQueue:
+    """In-process submission queue drained by a fixed pool of judge workers.
+
+    Workers obtain their service from ``service_factory`` and run every job
+    inside a fresh application context, so database sessions are never
+    shared between threads.
+    """
+    
+    def __init__(self, app: Flask, workers: int, service_factory: Callable):
+        self.app = app
+        self.workers = workers
+        self.service_factory = service_factory
+        
+        self._queue: queue.Queue = queue.Queue()
+        self._events: Dict[int, threading.Event] = {}
+        self._events_lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+    
+    def start(self):
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._worker_loop,
+                name=f'judge-worker-{index}',
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        
+        logger.info(f"Started {self.workers} judge workers")
+    
+    def stop(self):
+        # Queued submissions stay pending in the database and are picked up
+        # again by recover_pending on the next start; only the jobs already
+        # running are waited for.
+        while True:
+            try:
+                submission_id = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if submission_id is not None:
+                self._queue.task_done()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+    
+    def submit(self, submission_id: int):
+        with self._events_lock:
+            self._events.setdefault(submission_id, threading.Event())
+        self._queue.put(submission_id)
+    
+    def wait(self, submission_id: int, timeout: float) -> bool:
+        with self._events_lock:
+            event = self._events.get(submission_id)
+        
+        if event is None:
+            return True
+        return event.wait(timeout)
+    
+    def pending_count(self) -> int:
+        return self._queue.qsize()
+    
+    def recover_pending(self):
+        with self.app.app_context():
+            # Verdicts are written in one transaction with their results, so a
+            # submission still running was interrupted before anything of it
+            # was stored and can simply be judged again.
+            interrupted = Submission.query.filter_by(status=SubmissionStatus.RUNNING).update(
+                {'status': SubmissionStatus.PENDING}
+            )
+            db.session.commit()
+            if interrupted:
+                logger.warning(f"Reset {interrupted} interrupted submissions to pending")
+            
+            pending = Submission.query.filter_by(status=SubmissionStatus.PENDING).order_by(Submission.id.asc()).all()
+            pending_ids = [submission.id for submission in pending]
+        
+        for submission_id in pending_ids:
+            self.submit(submission_id)
+        
+        if pending_ids:
+            logger.info(f"Re-queued {len(pending_ids)} pending submissions")
+    
+    def _worker_loop(self):
+        service = None
+        
+        while True:
+            submission_id = self._queue.get()
+            if submission_id is None:
+                break
+            
+            try:
+                with self.app.app_context():
+                    if service is None:
+                        service = self.service_factory()
+                    service.judge_submission(submission_id)
+            except Exception as e:
+                logger.error(f"Judge worker failed on submission {submission_id}: {e}")
+                self._mark_failed(submission_id, str(e))
+            finally:
+                with self._events_lock:
+                    event = self._events.pop(submission_id, None)
+                if event is not None:
+                    event.set()
+                self._queue.task_done()
+    
+    def _mark_failed(self, submission_id: int, message: str):
+        try:
+            with self.app.app_context():
+                submission = Submission.query.get(submission_id)
+                if submission and submission.status != SubmissionStatus.COMPLETED:
+                    submission.status = SubmissionStatus.FAILED
+                    submission.result = SubmissionResult.INTERNAL_ERROR
+                    submission.runtime_error = message
+                    db.session.commit()
+        except Exception as e:
+            logger.error(f"Could not mark submission {submission_id} as failed: {e}")
+
+
+def get_judge_queue() -> Optional[JudgeQueue]:
+    return current_app.extensions.get('judge_queue')
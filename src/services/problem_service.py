@@ -2,6 +2,7 @@ import logging
 from typing import List, Optional, Dict, Any
 
 from models import db, Problem, TestCase
+from models.problem import CheckerType, VerdictPolicy
 from config.app import AppConfig
 
 
@@ -21,7 +22,12 @@ class ProblemService:
         time_limit_base: float = None,
         memory_limit: int = None,
         difficulty: str = 'medium',
-        tags: List[str] = None
+        tags: List[str] = None,
+        checker_type: str = None,
+        checker_abs_epsilon: float = None,
+        checker_rel_epsilon: float = None,
+        checker_source: str = None,
+        verdict_policy: str = None
     ) -> Problem:
         
         if max_input_size is None:
@@ -38,7 +44,11 @@ class ProblemService:
             time_limit_base=time_limit_base,
             memory_limit=memory_limit,
             difficulty=difficulty,
-            tags=','.join(tags) if tags else None
+            tags=','.join(tags) if tags else None,
+            verdict_policy=self._parse_verdict_policy(verdict_policy or VerdictPolicy.FULL_SCORING.value)
+        )
+        self._apply_checker(
+            problem, checker_type or CheckerType.EXACT.value, checker_abs_epsilon, checker_rel_epsilon, checker_source
         )
         
         db.session.add(problem)
@@ -79,6 +89,7 @@ class ProblemService:
         )
         
         db.session.add(test_case)
+        self._bump_test_set_version(problem)
         db.session.commit()
         
         logger.info(f"Added test case {test_case.id} ({name}) to problem {problem_id}")
@@ -135,17 +146,75 @@ class ProblemService:
             'memory_limit', 'difficulty', 'tags', 'is_active'
         ]
         
+        checker_fields = ['checker_type', 'checker_abs_epsilon', 'checker_rel_epsilon', 'checker_source']
+        
+        if any(field in kwargs for field in checker_fields):
+            self._apply_checker(
+                problem,
+                kwargs.get('checker_type', problem.checker_type.value if problem.checker_type else None),
+                kwargs.get('checker_abs_epsilon', problem.checker_abs_epsilon),
+                kwargs.get('checker_rel_epsilon', problem.checker_rel_epsilon),
+                kwargs.get('checker_source', problem.checker_source)
+            )
+        
+        if 'verdict_policy' in kwargs:
+            problem.verdict_policy = self._parse_verdict_policy(kwargs['verdict_policy'])
+        
         for field, value in kwargs.items():
             if field in allowed_fields:
                 if field == 'tags' and isinstance(value, list):
                     value = ','.join(value)
                 setattr(problem, field, value)
         
+        judging_fields = ['time_limit_base', 'memory_limit'] + checker_fields
+        if any(field in kwargs for field in judging_fields):
+            self._bump_test_set_version(problem)
+        
         db.session.commit()
         
         logger.info(f"Updated problem {problem_id}")
         return problem
     
+    def _bump_test_set_version(self, problem: Problem):
+        # Earlier verdicts no longer apply, so the verdict cache stops matching them.
+        problem.test_set_version = (problem.test_set_version or 1) + 1
+    
+    def _parse_verdict_policy(self, verdict_policy: str) -> VerdictPolicy:
+        try:
+            return VerdictPolicy(verdict_policy)
+        except ValueError:
+            valid = ', '.join(p.value for p in VerdictPolicy)
+            raise ValueError(f"Invalid verdict_policy: {verdict_policy} (expected one of: {valid})")
+    
+    def _apply_checker(
+        self,
+        problem: Problem,
+        checker_type: Optional[str],
+        abs_epsilon: Optional[float],
+        rel_epsilon: Optional[float],
+        source: Optional[str]
+    ):
+        try:
+            checker = CheckerType(checker_type or CheckerType.EXACT.value)
+        except ValueError:
+            valid = ', '.join(t.value for t in CheckerType)
+            raise ValueError(f"Invalid checker_type: {checker_type} (expected one of: {valid})")
+        
+        for name, value in (('checker_abs_epsilon', abs_epsilon), ('checker_rel_epsilon', rel_epsilon)):
+            if value is not None and (not isinstance(value, (int, float)) or value < 0):
+                raise ValueError(f"{name} must be a non-negative number")
+        if checker == CheckerType.FLOAT and abs_epsilon is None and rel_epsilon is None:
+            raise ValueError("Float checker requires checker_abs_epsilon or checker_rel_epsilon")
+        if checker == CheckerType.CUSTOM and not source:
+            raise ValueError("Custom checker requires checker_source")
+        if source and len(source) > self.config.MAX_SOURCE_CODE_SIZE:
+            raise ValueError(f"Checker source exceeds {self.config.MAX_SOURCE_CODE_SIZE} characters")
+        
+        problem.checker_type = checker
+        problem.checker_abs_epsilon = abs_epsilon
+        problem.checker_rel_epsilon = rel_epsilon
+        problem.checker_source = source
+    
     def delete_problem(self, problem_id: int) -> bool:
         
         problem = Problem.query.get(problem_id)
@@ -163,6 +232,7 @@ class ProblemService:
         if not test_case:
             return False
         
+        self._bump_test_set_version(test_case.problem)
         db.session.delete(test_case)
         db.session.commit()
         
@@ -0,0 +1,35 @@
+from flask import current_app
+
+from config.app import AppConfig
+from executor import create_executor
+from services.benchmark_service import BenchmarkService
+from services.problem_service import ProblemService
+from services.result_writer import ResultWriter
+from services.submission_service import SubmissionService
+from services.test_ordering import TestOrderingService
+
+
+class ServiceRegistry:
+    """Application-scoped services, built once in ``create_app``.
+
+    Services hold no per-request state, so every request and judge worker
+    shares these instances and the single executor behind them.
+    """
+    
+    def __init__(self, config: AppConfig, result_writer: ResultWriter = None):
+        self.config = config
+        self.executor = create_executor(config)
+        self.benchmarks = BenchmarkService(config, executor=self.executor)
+        self.test_ordering = TestOrderingService(config)
+        self.submissions = SubmissionService(
+            config,
+            executor=self.executor,
+            benchmark_service=self.benchmarks,
+            test_ordering=self.test_ordering,
+            result_writer=result_writer
+        )
+        self.problems = ProblemService(config)
+
+
+def get_services() -> ServiceRegistry:
+    return current_app.extensions['services']
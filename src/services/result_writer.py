@@ -0,0 +1,129 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from flask import Flask, current_app
+
+from models import db, Submission, SubmissionTestResult
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Write:
+    
+    submission_id: int
+    values: Dict[str, Any]
+    results: List[SubmissionTestResult]
+    done: Future = field(default_factory=Future)
+
+
+class ResultWriter:
+    """Single thread that commits the verdicts of all judge workers.
+
+    SQLite allows one writer at a time, so workers hand their final writes
+    here instead of committing themselves and competing for the lock. Writes
+    that arrive together are committed in one transaction, which also saves
+    an fsync per submission; a failing batch is retried one write at a time
+    so that one bad submission does not fail the others.
+    """
+    
+    def __init__(self, app: Flask, batch_size: int = 32, max_delay: float = 0.005):
+        self.app = app
+        self.batch_size = max(1, batch_size)
+        self.max_delay = max_delay
+        
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._stats_lock = threading.Lock()
+        self._writes = 0
+        self._batches = 0
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._writer_loop, name='result-writer', daemon=True)
+        self._thread.start()
+        
+        logger.info("Started result writer")
+    
+    def stop(self):
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        self._thread = None
+    
+    def write(self, submission_id: int, values: Dict[str, Any], results: List[SubmissionTestResult]) -> Future:
+        """Queue the submission column ``values`` and new ``results`` for one transaction."""
+        if self._thread is None:
+            raise RuntimeError("Result writer is not running")
+        
+        job = _Write(submission_id, values, results)
+        self._queue.put(job)
+        return job.done
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                'running': self._thread is not None,
+                'queued': self._queue.qsize(),
+                'writes': self._writes,
+                'batches': self._batches,
+                'average_batch': round(self._writes / self._batches, 2) if self._batches else 0.0
+            }
+    
+    def _writer_loop(self):
+        stopping = False
+        
+        while not stopping:
+            job = self._queue.get()
+            if job is None:
+                break
+            
+            # Gather whatever else arrives within max_delay into the same commit.
+            batch = [job]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.batch_size:
+                try:
+                    job = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if job is None:
+                    stopping = True
+                    break
+                batch.append(job)
+            
+            with self.app.app_context():
+                self._commit(batch)
+    
+    def _commit(self, batch: List[_Write]):
+        try:
+            db.session.bulk_save_objects([result for job in batch for result in job.results])
+            for job in batch:
+                Submission.query.filter_by(id=job.submission_id).update(job.values, synchronize_session=False)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            if len(batch) == 1:
+                logger.error(f"Could not write results of submission {batch[0].submission_id}: {e}")
+                batch[0].done.set_exception(e)
+                return
+            
+            logger.warning(f"Batch of {len(batch)} result writes failed, retrying one by one: {e}")
+            for job in batch:
+                self._commit([job])
+            return
+        
+        with self._stats_lock:
+            self._writes += len(batch)
+            self._batches += 1
+        for job in batch:
+            job.done.set_result(None)
+
+
+def get_result_writer() -> Optional[ResultWriter]:
+    return current_app.extensions.get('result_writer')
@@ -1,12 +1,25 @@
+import io
 import logging
-from typing import List, Optional, Dict, Any
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, TextIO
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, undefer, undefer_group
 
 from models import db, Problem, TestCase, Submission, SubmissionTestResult
+from models.problem import VerdictPolicy
 from models.submission import SubmissionStatus, SubmissionResult as SubmissionResultEnum, Language
 from models.submission_result import ErrorType
-from executor import DockerExecutor, ExecutionStatus
+from executor import (
+    ExecutionResult, ExecutionStatus, PreparedProgram, StoredInput, create_executor, get_answer_store, get_test_data_store
+)
+from checkers import CheckerError, CheckerRegistry, OutputChecker, bounded_diff
 from config.app import AppConfig
 from services.benchmark_service import BenchmarkService
+from services.result_writer import ResultWriter
+from services.test_ordering import TestOrderingService
+from services.verdict_cache import VerdictCache, source_hash
 
 
 logger = logging.getLogger(__name__)
@@ -14,17 +27,32 @@ logger = logging.getLogger(__name__)
 
 class SubmissionService:
     
-    def __init__(self, config: AppConfig = None):
+    def __init__(
+        self,
+        config: AppConfig = None,
+        executor=None,
+        benchmark_service: BenchmarkService = None,
+        test_ordering: TestOrderingService = None,
+        result_writer: ResultWriter = None
+    ):
         self.config = config or AppConfig()
-        self.executor = DockerExecutor(config)
-        self.benchmark_service = BenchmarkService(config)
+        self.executor = executor or create_executor(self.config)
+        self.benchmark_service = benchmark_service or BenchmarkService(self.config, executor=self.executor)
+        self.test_ordering = test_ordering or TestOrderingService(self.config)
+        self.result_writer = result_writer
+        self.verdict_cache = VerdictCache(self.config)
+        self.test_data = get_test_data_store(self.config)
+        self.answers = get_answer_store(self.config)
+        self.checkers = CheckerRegistry(self.config, self.executor)
     
     def create_submission(
         self, 
         problem_id: int, 
         language: str, 
         source_code: str, 
-        user_id: str = None
+        user_id: str = None,
+        execute: bool = True,
+        verdict_policy: str = None
     ) -> Submission:
         problem = Problem.query.get(problem_id)
         if not problem:
@@ -41,6 +69,13 @@ class SubmissionService:
         if len(source_code.encode('utf-8')) > self.config.MAX_SOURCE_CODE_SIZE:
             raise ValueError(f"Source code too large (max {self.config.MAX_SOURCE_CODE_SIZE} bytes)")
         
+        policy_enum = None
+        if verdict_policy is not None:
+            try:
+                policy_enum = VerdictPolicy(verdict_policy)
+            except ValueError:
+                raise ValueError(f"Unsupported verdict policy: {verdict_policy}")
+        
         active_benchmark = self.benchmark_service.get_active_benchmark(problem_id)
         
         submission = Submission(
@@ -48,8 +83,11 @@ class SubmissionService:
             user_id=user_id,
             language=lang_enum,
             source_code=source_code,
+            source_hash=source_hash(source_code),
             benchmark_id=active_benchmark.id if active_benchmark else None,
-            status=SubmissionStatus.PENDING
+            verdict_policy=policy_enum,
+            # Judged right away, so there is nothing to claim from the queue.
+            status=SubmissionStatus.RUNNING if execute else SubmissionStatus.PENDING
         )
         
         db.session.add(submission)
@@ -57,10 +95,42 @@ class SubmissionService:
         
         logger.info(f"Created submission {submission.id} for problem {problem_id} in {language}")
         
+        if execute:
+            self._judge(submission)
+        
+        return submission
+    
+    def judge_submission(self, submission_id: int) -> Optional[Submission]:
+        # Claiming the row with a conditional UPDATE keeps a submission from
+        # being judged twice when it is queued more than once.
+        claimed = Submission.query.filter_by(
+            id=submission_id, status=SubmissionStatus.PENDING
+        ).update({'status': SubmissionStatus.RUNNING})
+        db.session.commit()
+        
+        submission = Submission.query.get(submission_id)
+        if not claimed:
+            logger.info(f"Submission {submission_id} is not pending, skipping")
+            return submission
+        
+        return self._judge(submission)
+    
+    def _judge(self, submission: Submission) -> Submission:
+        # Everything below is written once, together with the verdict. Until
+        # then nothing is flushed, so no write lock is held while judging.
         try:
-            self._execute_submission(submission)
+            with db.session.no_autoflush:
+                cached = self.verdict_cache.lookup(submission)
+                if cached is not None:
+                    self._finalise(submission, self.verdict_cache.apply(submission, cached))
+                    logger.info(f"Submission {submission.id} completed: {submission.result.value} "
+                               f"(cached from submission {cached.id})")
+                    return submission
+                
+                self._execute_submission(submission)
         except Exception as e:
             logger.error(f"Submission execution failed: {e}")
+            db.session.rollback()
             submission.status = SubmissionStatus.FAILED
             submission.result = SubmissionResultEnum.INTERNAL_ERROR
             submission.runtime_error = str(e)
@@ -69,9 +139,7 @@ class SubmissionService:
         return submission
     
     def _execute_submission(self, submission: Submission):
-        submission.status = SubmissionStatus.RUNNING
-        db.session.commit()
-        
+        submission.test_set_version = submission.problem.test_set_version
         test_cases = TestCase.query.filter_by(problem_id=submission.problem_id).all()
         if not test_cases:
             raise ValueError(f"No test cases found for problem {submission.problem_id}")
@@ -83,167 +151,338 @@ class SubmissionService:
         
         logger.info(f"Executing submission {submission.id} with time limit {time_limit}s")
         
-        all_results = []
-        total_execution_time = 0.0
-        early_termination = False
-        
-        for test_case in test_cases:
-            if early_termination:
-                result = SubmissionTestResult(
-                    submission_id=submission.id,
-                    test_case_id=test_case.id,
-                    passed=False,
-                    error_type=ErrorType.INTERNAL_ERROR,
-                    error_message="Execution terminated early due to compilation error"
-                )
-                all_results.append(result)
-                continue
-            
-            result = self._execute_test_case(submission, test_case, time_limit)
-            all_results.append(result)
-            
-            if result.execution_time:
-                total_execution_time += result.execution_time
+        program = self._prepare_program(submission)
+        try:
+            if not program.success:
+                self._record_compilation_failure(submission, program.compilation, len(test_cases))
+                return
             
-            if result.error_type == ErrorType.INTERNAL_ERROR and "compilation" in (result.error_message or "").lower():
-                early_termination = True
-                submission.compilation_error = result.error_message
+            all_results = self._run_test_cases(submission, program, test_cases, time_limit)
+        finally:
+            self.executor.release(program)
         
-        for result in all_results:
-            db.session.add(result)
+        total_execution_time = sum(r.execution_time for r in all_results if r.execution_time)
         
         submission.execution_time_total = total_execution_time
-        submission.total_test_cases = len(all_results)
-        submission.passed_test_cases = sum(1 for r in all_results if r.passed)
-        submission.update_score()
-        
+        submission.memory_used = max((r.memory_used for r in all_results if r.memory_used), default=None)
+        submission.update_score(all_results, {test_case.id: test_case.weight for test_case in test_cases})
         submission.result = self._determine_overall_result(all_results)
         submission.status = SubmissionStatus.COMPLETED
         
-        db.session.commit()
+        # Results are reported in the problem's test order whatever order the
+        # tests were run in.
+        reporting_order = {test_case.id: position for position, test_case in enumerate(test_cases)}
+        all_results.sort(key=lambda result: reporting_order[result.test_case_id])
+        
+        self._finalise(submission, all_results)
         
         logger.info(f"Submission {submission.id} completed: {submission.result.value} "
                    f"({submission.passed_test_cases}/{submission.total_test_cases} passed, "
                    f"score: {submission.score:.2f})")
     
+    def _run_test_cases(
+        self, submission: Submission, program: PreparedProgram, test_cases: List[TestCase], time_limit: float
+    ) -> List[SubmissionTestResult]:
+        """Run and judge ``test_cases``, returning the results in run order."""
+        # Worker threads must not touch the session, so everything they need
+        # is resolved here while still on the request thread.
+        submission_id = submission.id
+        memory_limit = submission.problem.memory_limit
+        # Payloads are keyed by the sha256 recorded on the row, so they are
+        # streamed out of the payload store only the first time they are staged.
+        inputs = {
+            test_case.id: self.test_data.put_from(test_case.input_hash, test_case.input_bytes, test_case.open_input)
+            for test_case in test_cases
+        }
+        answers = {
+            test_case.id: self.answers.put_from(
+                test_case.expected_output_hash, test_case.expected_output_bytes, test_case.open_expected_output
+            )
+            for test_case in test_cases
+        }
+        checker = self.checkers.for_problem(submission.problem)
+        
+        if submission.effective_verdict_policy == VerdictPolicy.FIRST_FAILURE:
+            if self.config.TEST_ORDERING_ENABLED:
+                schedule = self.test_ordering.schedule(
+                    submission.problem_id, submission.language, test_cases, time_limit
+                )
+                test_cases = schedule.test_cases
+                logger.info(f"Submission {submission_id}: failure-likelihood order saves an expected "
+                           f"{schedule.expected_time_saved:.3f}s")
+            
+            # Tests run one at a time so that each output is judged before the
+            # next test starts; a wrong answer stops the run like any failure.
+            results = []
+            for test_case in test_cases:
+                if results and not results[-1].passed:
+                    results.append(self._skipped_result(submission_id, test_case))
+                else:
+                    results.append(self._execute_test_case(
+                        submission_id, program, test_case, inputs[test_case.id], answers[test_case.id], checker,
+                        time_limit, memory_limit
+                    ))
+            return results
+        
+        workers = max(1, min(self.config.PARALLEL_TEST_WORKERS, len(test_cases)))
+        # Consecutive test cases share one container through the batch API,
+        # sized so that every worker still gets a batch of its own.
+        batch_size = max(1, min(self.config.EXECUTION_BATCH_SIZE, math.ceil(len(test_cases) / workers)))
+        batches = [test_cases[i:i + batch_size] for i in range(0, len(test_cases), batch_size)]
+        
+        def run(batch: List[TestCase]) -> List[SubmissionTestResult]:
+            if len(batch) == 1:
+                test_case = batch[0]
+                return [self._execute_test_case(
+                    submission_id, program, test_case, inputs[test_case.id], answers[test_case.id], checker,
+                    time_limit, memory_limit
+                )]
+            return self._execute_batch(
+                submission_id, program, batch, inputs, answers, checker, time_limit, memory_limit
+            )
+        
+        results = []
+        if workers == 1:
+            for batch in batches:
+                results.extend(run(batch))
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'submission-{submission_id}') as pool:
+                # map() yields in submission order, so results stay aligned with test_cases.
+                for batch_results in pool.map(run, batches):
+                    results.extend(batch_results)
+        return results
+    
+    def _prepare_program(self, submission: Submission) -> PreparedProgram:
+        if submission.language == Language.CPP:
+            return self.executor.prepare_cpp(submission.source_code)
+        elif submission.language == Language.PYTHON:
+            return self.executor.prepare_python(submission.source_code)
+        else:
+            raise ValueError(f"Unsupported language: {submission.language}")
+    
+    def _record_compilation_failure(self, submission: Submission, compilation: ExecutionResult, total_test_cases: int):
+        if compilation.status == ExecutionStatus.COMPILATION_ERROR:
+            submission.result = SubmissionResultEnum.COMPILATION_ERROR
+            submission.compilation_error = compilation.stderr or compilation.error_message
+        else:
+            submission.result = SubmissionResultEnum.INTERNAL_ERROR
+            submission.runtime_error = compilation.error_message or "Unknown compilation error"
+        
+        submission.execution_time_total = 0.0
+        submission.total_test_cases = total_test_cases
+        submission.passed_test_cases = 0
+        submission.score = 0.0
+        submission.status = SubmissionStatus.COMPLETED
+        
+        self._finalise(submission, [])
+        
+        logger.info(f"Submission {submission.id} completed: {submission.result.value} (not executed)")
+    
+    def _finalise(self, submission: Submission, results: List[SubmissionTestResult]):
+        """Write the verdict set on ``submission`` and its new test results in one transaction."""
+        if self.result_writer is None:
+            # One multi-row INSERT instead of a flush per result. The objects
+            # are not attached to the session; submission.test_results
+            # reloads them after the commit.
+            db.session.bulk_save_objects(results)
+            db.session.commit()
+            return
+        
+        submission_id = submission.id
+        state = inspect(submission)
+        values = {
+            attr.key: state.attrs[attr.key].value
+            for attr in state.mapper.column_attrs
+            if state.attrs[attr.key].history.has_changes()
+        }
+        # The writer commits on its own connection. Discarding the unflushed
+        # changes here expires the submission, so it reloads the written row.
+        db.session.rollback()
+        self.result_writer.write(submission_id, values, results).result()
+    
     def _execute_test_case(
-        self, submission: Submission, test_case: TestCase, time_limit: float
+        self,
+        submission_id: int,
+        program: PreparedProgram,
+        test_case: TestCase,
+        stored_input: StoredInput,
+        stored_answer: StoredInput,
+        checker: OutputChecker,
+        time_limit: float,
+        memory_limit: int
     ) -> SubmissionTestResult:
         
+        try:
+            execution_result = self.executor.run_prepared(
+                program,
+                stored_input,
+                time_limit=time_limit,
+                memory_limit=memory_limit
+            )
+            return self._judge_test_case(
+                submission_id, test_case, stored_input, stored_answer, checker, execution_result, time_limit
+            )
+        
+        except Exception as e:
+            logger.error(f"Error executing test case {test_case.id}: {e}")
+            return self._internal_error_result(submission_id, test_case, str(e))
+    
+    def _execute_batch(
+        self,
+        submission_id: int,
+        program: PreparedProgram,
+        test_cases: List[TestCase],
+        inputs: Dict[int, StoredInput],
+        answers: Dict[int, StoredInput],
+        checker: OutputChecker,
+        time_limit: float,
+        memory_limit: int
+    ) -> List[SubmissionTestResult]:
+        
+        try:
+            execution_results = self.executor.execute_batch(
+                program,
+                [inputs[test_case.id] for test_case in test_cases],
+                time_limit=time_limit,
+                memory_limit=memory_limit
+            )
+            return [
+                self._judge_test_case(
+                    submission_id, test_case, inputs[test_case.id], answers[test_case.id], checker,
+                    execution_result, time_limit
+                )
+                for test_case, execution_result in zip(test_cases, execution_results)
+            ]
+        
+        except Exception as e:
+            logger.error(f"Error executing batch of {len(test_cases)} test cases: {e}")
+            return [self._internal_error_result(submission_id, test_case, str(e)) for test_case in test_cases]
+    
+    def _skipped_result(self, submission_id: int, test_case: TestCase) -> SubmissionTestResult:
+        return SubmissionTestResult(
+            submission_id=submission_id,
+            test_case_id=test_case.id,
+            passed=False,
+            error_type=ErrorType.SKIPPED,
+            error_message="Skipped after an earlier test failed"
+        )
+    
+    def _internal_error_result(self, submission_id: int, test_case: TestCase, message: str) -> SubmissionTestResult:
+        return SubmissionTestResult(
+            submission_id=submission_id,
+            test_case_id=test_case.id,
+            passed=False,
+            error_type=ErrorType.INTERNAL_ERROR,
+            error_message=message
+        )
+    
+    def _judge_test_case(
+        self,
+        submission_id: int,
+        test_case: TestCase,
+        stored_input: StoredInput,
+        stored_answer: StoredInput,
+        checker: OutputChecker,
+        execution_result: ExecutionResult,
+        time_limit: float
+    ) -> SubmissionTestResult:
+        
+        if execution_result.status == ExecutionStatus.SKIPPED:
+            return self._skipped_result(submission_id, test_case)
+        
         result = SubmissionTestResult(
-            submission_id=submission.id,
+            submission_id=submission_id,
             test_case_id=test_case.id
         )
         
-        try:
-            if submission.language == Language.CPP:
-                execution_result = self.executor.execute_cpp(
-                    submission.source_code,
-                    test_case.input_data,
-                    time_limit=time_limit,
-                    memory_limit=submission.problem.memory_limit
-                )
-            elif submission.language == Language.PYTHON:
-                execution_result = self.executor.execute_python(
-                    submission.source_code,
-                    test_case.input_data,
-                    time_limit=time_limit,
-                    memory_limit=submission.problem.memory_limit
-                )
-            else:
-                raise ValueError(f"Unsupported language: {submission.language}")
-            
-            result.execution_time = execution_result.execution_time
-            result.memory_used = execution_result.memory_used
-            result.container_id = execution_result.container_id
-            result.stdout = execution_result.stdout
-            result.stderr = execution_result.stderr
-            result.exit_code = execution_result.exit_code
-            
-            if execution_result.status == ExecutionStatus.COMPILATION_ERROR:
-                result.error_type = ErrorType.INTERNAL_ERROR
-                result.error_message = "Compilation failed"
-                result.passed = False
-                return result
-            
-            if execution_result.status == ExecutionStatus.TIME_LIMIT_EXCEEDED:
-                result.error_type = ErrorType.TIME_LIMIT_EXCEEDED
-                result.error_message = f"Time limit exceeded ({time_limit}s)"
-                result.passed = False
-                return result
-            
-            if execution_result.status == ExecutionStatus.MEMORY_LIMIT_EXCEEDED:
-                result.error_type = ErrorType.MEMORY_LIMIT_EXCEEDED
-                result.error_message = "Memory limit exceeded"
-                result.passed = False
-                return result
-            
-            if execution_result.status == ExecutionStatus.RUNTIME_ERROR:
-                if any(keyword in execution_result.stderr.lower() for keyword in ['stack overflow', 'segmentation fault']):
-                    result.error_type = ErrorType.STACK_OVERFLOW
-                    result.error_message = "Stack overflow detected"
-                else:
-                    result.error_type = ErrorType.RUNTIME_ERROR
-                    result.error_message = f"Runtime error (exit code: {execution_result.exit_code})"
-                result.passed = False
-                return result
-            
-            if not execution_result.success:
-                result.error_type = ErrorType.INTERNAL_ERROR
-                result.error_message = execution_result.error_message or "Unknown execution error"
-                result.passed = False
-                return result
-            
-            expected_output = test_case.expected_output.strip()
-            actual_output = execution_result.stdout.strip()
-            result.actual_output = actual_output
-            
-            if expected_output == actual_output:
-                result.passed = True
-                result.error_type = ErrorType.NONE
+        result.execution_time = execution_result.execution_time
+        result.memory_used = execution_result.memory_used
+        result.container_id = execution_result.container_id
+        result.stdout = execution_result.stdout
+        result.stderr = execution_result.stderr
+        result.exit_code = execution_result.exit_code
+        
+        if execution_result.status == ExecutionStatus.TIME_LIMIT_EXCEEDED:
+            result.error_type = ErrorType.TIME_LIMIT_EXCEEDED
+            result.error_message = f"Time limit exceeded ({time_limit}s)"
+            result.passed = False
+            return result
+        
+        if execution_result.status == ExecutionStatus.MEMORY_LIMIT_EXCEEDED:
+            result.error_type = ErrorType.MEMORY_LIMIT_EXCEEDED
+            result.error_message = "Memory limit exceeded"
+            result.passed = False
+            return result
+        
+        if execution_result.status == ExecutionStatus.OUTPUT_LIMIT_EXCEEDED:
+            result.error_type = ErrorType.OUTPUT_LIMIT_EXCEEDED
+            result.error_message = f"Output limit exceeded ({self.config.OUTPUT_LIMIT} bytes)"
+            result.passed = False
+            return result
+        
+        if execution_result.status == ExecutionStatus.RUNTIME_ERROR:
+            diagnostics = f"{execution_result.stderr} {execution_result.error_message or ''}".lower()
+            if any(keyword in diagnostics for keyword in ['stack overflow', 'segmentation fault']):
+                result.error_type = ErrorType.STACK_OVERFLOW
+                result.error_message = "Stack overflow detected"
             else:
-                result.passed = False
-                result.error_type = ErrorType.WRONG_ANSWER
-                result.error_message = "Output does not match expected result"
-                result.output_diff = self._generate_diff(expected_output, actual_output)
-            
-        except Exception as e:
-            logger.error(f"Error executing test case {test_case.id}: {e}")
+                result.error_type = ErrorType.RUNTIME_ERROR
+                result.error_message = f"Runtime error (exit code: {execution_result.exit_code})"
+            result.passed = False
+            return result
+        
+        if not execution_result.success:
             result.error_type = ErrorType.INTERNAL_ERROR
-            result.error_message = str(e)
+            result.error_message = execution_result.error_message or "Unknown execution error"
             result.passed = False
+            return result
         
-        return result
-    
-    def _generate_diff(self, expected: str, actual: str) -> str:
-        import difflib
+        actual_output = execution_result.stdout or ''
+        result.actual_output = actual_output.strip()
         
-        expected_lines = expected.splitlines(keepends=True)
-        actual_lines = actual.splitlines(keepends=True)
+        try:
+            comparison = checker.check(stored_input, stored_answer, actual_output)
+        except CheckerError as e:
+            logger.error(f"Checker error on test case {test_case.id}: {e}")
+            result.passed = False
+            result.error_type = ErrorType.INTERNAL_ERROR
+            result.error_message = str(e)
+            return result
         
-        diff = list(difflib.unified_diff(
-            expected_lines, actual_lines,
-            fromfile='expected', tofile='actual',
-            lineterm=''
-        ))
+        if comparison.equal:
+            result.passed = True
+            result.error_type = ErrorType.NONE
+        else:
+            result.passed = False
+            result.error_type = (
+                ErrorType.PRESENTATION_ERROR if comparison.presentation_error else ErrorType.WRONG_ANSWER
+            )
+            result.error_message = comparison.message
+            with open(self.answers.path_for(stored_answer), encoding='utf-8', errors='replace') as expected:
+                result.output_diff = self._generate_diff(expected, result.actual_output)
         
-        return ''.join(diff[:50])
+        return result
+    
+    def _generate_diff(self, expected: TextIO, actual: str) -> str:
+        return bounded_diff(
+            expected, io.StringIO(actual),
+            max_divergent=self.config.OUTPUT_DIFF_MAX_LINES,
+            context=self.config.OUTPUT_DIFF_CONTEXT,
+            max_bytes=self.config.OUTPUT_DIFF_MAX_BYTES
+        )
     
     def _determine_overall_result(self, results: List[SubmissionTestResult]) -> SubmissionResultEnum:
         
         if not results:
             return SubmissionResultEnum.INTERNAL_ERROR
         
-        if any(r.error_type == ErrorType.INTERNAL_ERROR and "compilation" in (r.error_message or "").lower() 
-               for r in results):
-            return SubmissionResultEnum.COMPILATION_ERROR
-        
         if all(r.passed for r in results):
             return SubmissionResultEnum.ACCEPTED
         
         error_priority = [
             (ErrorType.TIME_LIMIT_EXCEEDED, SubmissionResultEnum.TIME_LIMIT_EXCEEDED),
             (ErrorType.MEMORY_LIMIT_EXCEEDED, SubmissionResultEnum.MEMORY_LIMIT_EXCEEDED),
+            (ErrorType.OUTPUT_LIMIT_EXCEEDED, SubmissionResultEnum.OUTPUT_LIMIT_EXCEEDED),
             (ErrorType.STACK_OVERFLOW, SubmissionResultEnum.STACK_OVERFLOW),
             (ErrorType.RUNTIME_ERROR, SubmissionResultEnum.RUNTIME_ERROR),
             (ErrorType.WRONG_ANSWER, SubmissionResultEnum.WRONG_ANSWER),
@@ -258,7 +497,8 @@ class SubmissionService:
         return SubmissionResultEnum.WRONG_ANSWER
     
     def get_submission(self, submission_id: int, include_code: bool = False) -> Optional[Submission]:
-        return Submission.query.get(submission_id)
+        options = [undefer(Submission.source_code)] if include_code else []
+        return db.session.get(Submission, submission_id, options=options)
     
     def get_submissions_for_problem(
         self, problem_id: int, user_id: str = None, limit: int = 100
@@ -270,5 +510,11 @@ class SubmissionService:
         
         return query.order_by(Submission.created_at.desc()).limit(limit).all()
     
-    def get_submission_results(self, submission_id: int) -> List[SubmissionTestResult]:
-        return SubmissionTestResult.query.filter_by(submission_id=submission_id).all()
+    def get_submission_results(self, submission_id: int, include_output: bool = False) -> List[SubmissionTestResult]:
+        # Test cases are joined in, since callers describe every result's test case.
+        query = SubmissionTestResult.query.filter_by(submission_id=submission_id).options(
+            joinedload(SubmissionTestResult.test_case)
+        )
+        if include_output:
+            query = query.options(undefer_group('output'))
+        return query.all()
@@ -0,0 +1,140 @@
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import case, func
+
+from models import db, TestCase, Submission, SubmissionTestResult
+from models.submission import Language
+from models.submission_result import ErrorType
+from config.app import AppConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TestCaseStats:
+    
+    test_case_id: int
+    runs: int = 0
+    failures: int = 0
+    mean_time: Optional[float] = None
+    
+    @property
+    def failure_probability(self) -> float:
+        # Laplace smoothing keeps unseen tests at 0.5 and no test at 0 or 1.
+        return (self.failures + 1) / (self.runs + 2)
+    
+    def to_dict(self) -> Dict:
+        return {
+            'test_case_id': self.test_case_id,
+            'runs': self.runs,
+            'failures': self.failures,
+            'failure_rate': self.failures / self.runs if self.runs else None,
+            'failure_probability': round(self.failure_probability, 4),
+            'mean_time': self.mean_time
+        }
+
+
+@dataclass
+class TestSchedule:
+    
+    test_cases: List[TestCase]
+    stats: Dict[int, TestCaseStats]
+    expected_time: float
+    baseline_expected_time: float
+    
+    @property
+    def expected_time_saved(self) -> float:
+        return self.baseline_expected_time - self.expected_time
+    
+    def to_dict(self) -> Dict:
+        return {
+            'order': [test_case.id for test_case in self.test_cases],
+            'expected_time': round(self.expected_time, 4),
+            'baseline_expected_time': round(self.baseline_expected_time, 4),
+            'expected_time_saved': round(self.expected_time_saved, 4),
+            'tests': [self.stats[test_case.id].to_dict() for test_case in self.test_cases]
+        }
+
+
+class TestOrderingService:
+    """Orders test cases so that failing submissions are rejected early.
+
+    Per-test failure rates and mean run times are taken from the stored
+    results of earlier submissions in the same language. When tests run until
+    the first failure, the expected judging time is smallest when they are
+    sorted by mean time over failure probability, so cheap tests that often
+    fail go first.
+    """
+    
+    # Results that say nothing about the solution itself.
+    IGNORED_ERRORS = (ErrorType.SKIPPED, ErrorType.INTERNAL_ERROR)
+    
+    def __init__(self, config: AppConfig = None):
+        self.config = config or AppConfig()
+    
+    def get_stats(self, problem_id: int, language: Language) -> Dict[int, TestCaseStats]:
+        rows = db.session.query(
+            SubmissionTestResult.test_case_id,
+            func.count(SubmissionTestResult.id),
+            func.sum(case((SubmissionTestResult.passed.is_(False), 1), else_=0)),
+            func.avg(SubmissionTestResult.execution_time)
+        ).join(
+            Submission, Submission.id == SubmissionTestResult.submission_id
+        ).filter(
+            Submission.problem_id == problem_id,
+            Submission.language == language,
+            SubmissionTestResult.error_type.notin_(self.IGNORED_ERRORS)
+        ).group_by(SubmissionTestResult.test_case_id).all()
+        
+        return {
+            test_case_id: TestCaseStats(test_case_id, runs, int(failures or 0), mean_time)
+            for test_case_id, runs, failures, mean_time in rows
+        }
+    
+    def schedule(
+        self, problem_id: int, language: Language, test_cases: Sequence[TestCase], time_limit: float
+    ) -> TestSchedule:
+        stats = self.get_stats(problem_id, language)
+        for test_case in test_cases:
+            stats.setdefault(test_case.id, TestCaseStats(test_case.id))
+        
+        # Tests without enough history are estimated from the others, falling
+        # back to the time limit when there is no history at all.
+        known_times = [
+            stats[tc.id].mean_time for tc in test_cases
+            if stats[tc.id].runs >= self.config.TEST_ORDERING_MIN_RUNS and stats[tc.id].mean_time is not None
+        ]
+        default_time = sum(known_times) / len(known_times) if known_times else time_limit
+        
+        def estimated_time(test_case: TestCase) -> float:
+            test_stats = stats[test_case.id]
+            if test_stats.runs >= self.config.TEST_ORDERING_MIN_RUNS and test_stats.mean_time is not None:
+                return test_stats.mean_time
+            return default_time
+        
+        def failure_probability(test_case: TestCase) -> float:
+            test_stats = stats[test_case.id]
+            if test_stats.runs >= self.config.TEST_ORDERING_MIN_RUNS:
+                return test_stats.failure_probability
+            return 0.5
+        
+        def expected_time(order: Sequence[TestCase]) -> float:
+            total = 0.0
+            still_running = 1.0
+            for test_case in order:
+                total += still_running * estimated_time(test_case)
+                still_running *= 1.0 - failure_probability(test_case)
+            return total
+        
+        # sorted() is stable, so ties keep the original order.
+        ordered = sorted(test_cases, key=lambda tc: estimated_time(tc) / failure_probability(tc))
+        
+        return TestSchedule(
+            test_cases=ordered,
+            stats=stats,
+            expected_time=expected_time(ordered),
+            baseline_expected_time=expected_time(test_cases)
+        )
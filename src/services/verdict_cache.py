@@ -0,0 +1,122 @@
+import hashlib
+import logging
+import threading
+from typing import List, Optional
+
+from sqlalchemy.orm import undefer_group
+
+from models import db, Submission, SubmissionTestResult
+from models.submission import SubmissionStatus, SubmissionResult
+from models.submission_result import ErrorType
+from config.app import AppConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+def source_hash(source_code: str) -> str:
+    return hashlib.sha256(source_code.encode('utf-8')).hexdigest()
+
+
+class VerdictCache:
+    """Reuses the verdict of an earlier, byte-identical submission.
+
+    A submission matches when it has the same problem, language, source hash,
+    benchmark and test set version as one that already completed, and is
+    judged under the same verdict policy. The benchmark is fixed when a
+    submission is created from the problem's active benchmark, and the test
+    set version is bumped whenever the problem's tests or judging settings
+    change, so stale entries simply stop matching. Outcomes caused by the
+    judge itself are never reused.
+    """
+    
+    # Look at a few candidates, since the verdict policy is resolved per row.
+    MAX_CANDIDATES = 5
+    
+    def __init__(self, config: AppConfig = None):
+        self.config = config or AppConfig()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+    
+    def lookup(self, submission: Submission) -> Optional[Submission]:
+        if not self.config.VERDICT_CACHE_ENABLED or not submission.source_hash:
+            return None
+        
+        unreliable = db.session.query(SubmissionTestResult.id).filter(
+            SubmissionTestResult.submission_id == Submission.id,
+            SubmissionTestResult.error_type == ErrorType.INTERNAL_ERROR
+        ).exists()
+        candidates = Submission.query.filter(
+            Submission.id != submission.id,
+            Submission.problem_id == submission.problem_id,
+            Submission.language == submission.language,
+            Submission.source_hash == submission.source_hash,
+            # Compiles to IS NULL for submissions without a benchmark.
+            Submission.benchmark_id == submission.benchmark_id,
+            Submission.test_set_version == submission.problem.test_set_version,
+            Submission.status == SubmissionStatus.COMPLETED,
+            Submission.result != SubmissionResult.INTERNAL_ERROR,
+            ~unreliable
+        ).order_by(Submission.id.desc()).limit(self.MAX_CANDIDATES).all()
+        
+        policy = submission.effective_verdict_policy
+        cached = next((c for c in candidates if c.effective_verdict_policy == policy), None)
+        
+        with self._lock:
+            if cached is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return cached
+    
+    def apply(self, submission: Submission, cached: Submission) -> List[SubmissionTestResult]:
+        """Copy the verdict of ``cached`` onto ``submission`` and return copies of its test results.
+
+        The returned results are not added to the session; the caller writes
+        them together with the verdict.
+        """
+        results = [
+            SubmissionTestResult(
+                submission_id=submission.id,
+                test_case_id=result.test_case_id,
+                passed=result.passed,
+                execution_time=result.execution_time,
+                memory_used=result.memory_used,
+                actual_output=result.actual_output,
+                output_diff=result.output_diff,
+                error_type=result.error_type,
+                error_message=result.error_message,
+                exit_code=result.exit_code,
+                container_id=result.container_id,
+                stdout=result.stdout,
+                stderr=result.stderr
+            )
+            for result in SubmissionTestResult.query.filter_by(submission_id=cached.id).options(
+                undefer_group('output')
+            )
+        ]
+        
+        submission.cached_from_id = cached.id
+        submission.test_set_version = cached.test_set_version
+        submission.time_limit_used = cached.time_limit_used
+        submission.result = cached.result
+        submission.execution_time_total = cached.execution_time_total
+        submission.memory_used = cached.memory_used
+        submission.score = cached.score
+        submission.passed_test_cases = cached.passed_test_cases
+        submission.total_test_cases = cached.total_test_cases
+        submission.compilation_error = cached.compilation_error
+        submission.runtime_error = cached.runtime_error
+        submission.status = SubmissionStatus.COMPLETED
+        return results
+    
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.config.VERDICT_CACHE_ENABLED,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }